@@ -0,0 +1,75 @@
+"""
+Cost of a chase frame against the number of chasers, with a search per chaser and with the flow field of the grid.
+
+A target walks across the level between random squares, and every time it steps on another square each chaser plans
+its path to the target's square again and steps one square along it, like the enemies chasing the player. The
+chase is timed with the A* path finder of the grid and with the flow field of the grid shared by every chaser,
+reporting the time per step of the target.
+
+Usage:
+    python -m benchmarks.flow_field [steps]
+"""
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import numpy as np
+import pygame
+
+from benchmarks.grid_memory import load_grid
+from utils.constants import SQUARE_SIZE
+from utils.paths.maps_paths import LEVELS
+
+# Number of chasers of every chase
+CHASERS = (1, 2, 4, 8, 16)
+
+
+def run(grid, chasers: int, steps: int, planner: str) -> float:
+    """Chase a walking target, returning the milliseconds per step of the target."""
+    rng = random.Random(chasers)
+    size = grid.size
+    walkable = np.argwhere(~grid.barrier).tolist()
+    route = []
+    starts = [grid.get_node_from_array(*rng.choice(walkable)) for _ in range(chasers)]
+    if planner == 'flow':
+        finders = [grid.flow_field] * chasers
+    else:
+        finders = [grid.path_finder] * chasers
+    grid.flow_field.centre = -1
+
+    elapsed = 0.0
+    target = grid.get_node_from_array(*rng.choice(walkable))
+    for _ in range(steps):
+        while not route:
+            route = grid.path_finder.find_path(target, grid.get_node_from_array(*rng.choice(walkable)))[1:]
+        target = route.pop(0)
+        end = target.row * size + target.col
+        begin = time.perf_counter()
+        paths = [finder.find_cells(start.row * size + start.col, end) for finder, start in zip(finders, starts)]
+        elapsed += time.perf_counter() - begin
+        starts = [grid.get_node_from_array(*divmod(path[min(1, len(path) - 1)], size)) if path else start
+                  for path, start in zip(paths, starts)]
+    return elapsed / steps * 1000
+
+
+def main() -> None:
+    steps = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    pygame.init()
+    window = pygame.display.set_mode((SQUARE_SIZE, SQUARE_SIZE))
+
+    print(f"{'level':<8}{'planner':<14}" + ''.join(f"{f'{chasers} (ms)':>10}" for chasers in CHASERS))
+    for level_number, level_path in LEVELS.items():
+        grid = load_grid(window, level_path)
+        for planner in ('A*', 'flow'):
+            times = [run(grid, chasers, steps, planner) for chasers in CHASERS]
+            print(f"{level_number:<8}{planner:<14}" + ''.join(f"{elapsed:>10.2f}" for elapsed in times))
+
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
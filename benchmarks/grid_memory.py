@@ -0,0 +1,124 @@
+"""
+Memory footprint of the grid of every level.
+
+Compares the former layout, where the grid held one Square object per cell with its own surface, rectangle and
+neighbour lists, against the array-backed grid with lazily allocated Square views.
+
+Usage:
+    python -m benchmarks.grid_memory
+"""
+import json
+import os
+import tracemalloc
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+from game.map.grid import Grid
+from utils.constants import SQUARE_SIZE, WHITE
+from utils.paths.maps_paths import LEVELS
+
+
+class LegacySquare:
+    """Replica of the per-cell state kept by the former Square class."""
+
+    def __init__(self, row, col, size, total_rows, total_cols, weight):
+        self.row = row
+        self.col = col
+        self.x = (row * size) + size * 0.5
+        self.y = (col * size) + size * 0.5
+        self.size = size
+        self.total_rows = total_rows
+        self.total_cols = total_cols
+        self.neighbors = []
+        self.barriers = []
+        self.id = -1
+        self.tile_id = []
+        self.barrier = False
+        self.color = (0, 0, 0)
+        self.weight = weight
+        self.hover = False
+        self.image = pygame.Surface((self.size, self.size))
+        self.image.fill(WHITE)
+        self.rect = pygame.Rect((row * size), (col * size), size + 1, size + 1)
+        self.is_key = False
+        self.is_exit = False
+        self._current_frame = 0
+        self._delay_frame = 2
+        self._pass_frame = self._delay_frame
+        self._jump_frame = 1
+        self._state = 0
+        self._key_offset = 0
+        self._key_speed = 0.25
+        self._key_limit = 1.5
+
+
+def load_grid(window: pygame.Surface, level_path: str) -> Grid:
+    with open(level_path, 'r') as file:
+        level = json.load(file)
+    return Grid(
+        size=100,
+        win=window,
+        border_map_path=level['level_map']['border_map_path'],
+        tile_map_path=level['level_map']['tile_map_path'],
+        objects_map_path=level['level_map']['objects_map_path'],
+        sprite_sheet_path=level['level_sprite_sheet']['path'],
+        ss_columns=level['level_sprite_sheet']['columns'],
+        ss_rows=level['level_sprite_sheet']['rows']
+    )
+
+
+def legacy_footprint(grid: Grid) -> int:
+    """Bytes used by the former nested list of Square objects that mirror the given grid."""
+    tracemalloc.start()
+    squares = [[LegacySquare(row, col, grid.gap, grid.size, grid.size, int(grid.weight[row, col]))
+                for col in range(grid.size)] for row in range(grid.size)]
+    for row in squares:
+        for square in row:
+            square.id = int(grid.room[square.row, square.col])
+            square.tile_id = grid.get_node_from_array(square.row, square.col).tile_id
+            square.barrier = bool(grid.barrier[square.row, square.col])
+            for neighbour in grid.get_neighbours(square.row, square.col):
+                square.neighbors.append(squares[neighbour.row][neighbour.col])
+            for barrier in grid.get_barriers(square.row, square.col):
+                square.barriers.append(squares[barrier.row][barrier.col])
+    python_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Pixel buffers are allocated by SDL, outside the reach of tracemalloc
+    pixel_bytes = sum(square.image.get_pitch() * square.image.get_height() for row in squares for square in row)
+    return python_bytes + pixel_bytes
+
+
+def array_footprint(grid: Grid) -> int:
+    """Bytes used by the grid arrays plus every Square view, with all of them allocated and resolved."""
+    arrays = sum(value.nbytes for value in vars(grid).values() if hasattr(value, 'nbytes'))
+
+    tracemalloc.start()
+    grid._squares = [None] * (grid.size * grid.size)
+    for row in range(grid.size):
+        for col in range(grid.size):
+            square = grid.get_node_from_array(row, col)
+            _ = square.rect, square.neighbors, square.barriers
+    views, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return arrays + views
+
+
+def main() -> None:
+    pygame.init()
+    window = pygame.display.set_mode((SQUARE_SIZE, SQUARE_SIZE))
+
+    print(f"{'level':<8}{'before (MB)':>14}{'after (MB)':>14}{'ratio':>10}")
+    for level_number, level_path in LEVELS.items():
+        grid = load_grid(window, level_path)
+        before = legacy_footprint(grid)
+        after = array_footprint(grid)
+        print(f"{level_number:<8}{before / 2 ** 20:>14.2f}{after / 2 ** 20:>14.2f}{before / after:>9.1f}x")
+
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Squares expanded by a jump point finder against the A* path finder of the grid on every level.
+
+Plans the same random pairs of walkable squares with both planners, and reports the squares expanded per search, the
+time per search and the average length of the paths found. The jump point finder walks the shortest paths in pixels,
+while the A* path finder follows the rules of the former Enemy.a_star, so the paths found differ.
+
+Usage:
+    python -m benchmarks.jump_point_search [pairs]
+"""
+import math
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+from benchmarks.grid_memory import load_grid
+from benchmarks.pathfinding import random_pairs
+from game.pathfinding.jps import JumpPointFinder
+from utils.constants import SQUARE_SIZE
+from utils.paths.maps_paths import LEVELS
+
+
+def path_length(path: list) -> float:
+    """Pixels walked along a path of squares."""
+    return sum(math.dist(first.get_pos(), second.get_pos()) for first, second in zip(path, path[1:]))
+
+
+def run(finder, pairs: list) -> tuple:
+    """Plan every pair with a finder, returning the expansions, time and length per search."""
+    expansions = 0
+    length = 0
+    begin = time.perf_counter()
+    for start, end in pairs:
+        length += path_length(finder.find_path(start, end))
+        expansions += finder.expansions
+    elapsed = time.perf_counter() - begin
+    return expansions / len(pairs), elapsed / len(pairs) * 1000, length / len(pairs)
+
+
+def main() -> None:
+    pairs_per_level = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    pygame.init()
+    window = pygame.display.set_mode((SQUARE_SIZE, SQUARE_SIZE))
+
+    print(f"{'level':<8}{'planner':<12}{'expanded':>10}{'time (ms)':>12}{'length (px)':>14}")
+    for level_number, level_path in LEVELS.items():
+        grid = load_grid(window, level_path)
+        pairs = random_pairs(grid, pairs_per_level, level_number)
+
+        for name, finder in (('A*', grid.path_finder), ('JPS', JumpPointFinder(grid))):
+            expansions, elapsed, length = run(finder, pairs)
+            print(f"{level_number:<8}{name:<12}{expansions:>10.1f}{elapsed:>12.2f}{length:>14.1f}")
+
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
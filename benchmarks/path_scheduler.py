@@ -0,0 +1,90 @@
+"""
+Frame times of the enemies of every level when they all replan at once.
+
+Spawns the enemies of each level and updates them for a number of frames, making every enemy ask for a new path every
+few frames, like after a detection is broadcast. The frames are timed with every path planned on the spot, with the
+paths served by the path scheduler of the level, and with the searches of the scheduler sent to worker processes.
+The frames where the scheduler overran its budget are counted, since a single search is never split.
+
+Usage:
+    python -m benchmarks.path_scheduler [frames]
+"""
+import gc
+import json
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+from benchmarks.grid_memory import load_grid
+from game.groups.enemies_group import Enemies
+from game.pathfinding.scheduler import PathScheduler
+from game.pathfinding.workers import PathWorkerPool
+from utils.constants import SQUARE_SIZE
+from utils.paths.maps_paths import LEVELS
+
+# Frames between two bursts where every enemy replans
+BURST_PERIOD = 30
+
+# Worker processes of the worker pool
+WORKERS = 2
+
+
+def run(window: pygame.Surface, level_path: str, frames: int, scheduled: bool, workers: int = 0) -> tuple:
+    """Update the enemies of a level, returning the time of every frame in milliseconds and the budget overruns."""
+    random.seed(0)
+    with open(level_path, 'r') as file:
+        level = json.load(file)
+    grid = load_grid(window, level_path)
+    group = Enemies()
+    enemies = group.spawn(grid, window, level['enemies'])
+    scheduler = PathScheduler(pool=PathWorkerPool(grid, workers) if workers else None) if scheduled else None
+    for enemy in enemies:
+        Enemies.introduce(enemy, group)
+        enemy.path_scheduler = scheduler
+
+    # Garbage left by the former run would be collected in the middle of this one, in a frame of its own
+    gc.collect()
+    times = []
+    for frame in range(frames):
+        begin = time.perf_counter()
+        if scheduler is not None:
+            scheduler.deliver()
+        for enemy in enemies:
+            if frame % BURST_PERIOD == 0:
+                enemy.set_path()
+            enemy.update()
+        if scheduler is not None:
+            scheduler.run()
+        times.append((time.perf_counter() - begin) * 1000)
+
+    overruns = 0
+    if scheduler is not None:
+        overruns = scheduler.overruns
+        scheduler.clear()
+    return times, overruns
+
+
+def main() -> None:
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+
+    pygame.init()
+    window = pygame.display.set_mode((SQUARE_SIZE, SQUARE_SIZE))
+
+    print(f"{'level':<8}{'planning':<12}{'mean (ms)':>11}{'p99 (ms)':>10}{'max (ms)':>10}{'overruns':>10}")
+    for level_number, level_path in LEVELS.items():
+        for name, scheduled, workers in (('on the spot', False, 0), ('scheduled', True, 0), ('workers', True, WORKERS)):
+            times, overruns = run(window, level_path, frames, scheduled, workers)
+            times.sort()
+            print(f"{level_number:<8}{name:<12}{sum(times) / len(times):>11.2f}"
+                  f"{times[int(len(times) * 0.99)]:>10.2f}{times[-1]:>10.2f}{overruns if scheduled else '-':>10}")
+
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Speed of the path finder of the grid on every level.
+
+Plans the same random pairs of walkable squares with the former Enemy.a_star, reproduced here as it was before the path
+finder, filling its score dictionaries with every square of the grid and allocating its queue on every call, and with
+the PathFinder of the grid, checking that both return the same paths.
+
+Usage:
+    python -m benchmarks.pathfinding [pairs]
+"""
+import os
+import random
+import sys
+import time
+from queue import PriorityQueue
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import numpy as np
+import pygame
+
+from benchmarks.grid_memory import load_grid
+from utils.algorithms import heuristic, reconstruct_path
+from utils.constants import SQUARE_SIZE
+from utils.paths.maps_paths import LEVELS
+
+
+def random_pairs(grid, count: int, seed: int = 0) -> list:
+    """Pairs of random walkable squares of a grid, the same ones on every run."""
+    rng = random.Random(seed)
+    walkable = np.argwhere(~grid.barrier).tolist()
+    pairs = []
+    for _ in range(count):
+        start = grid.get_node_from_array(*rng.choice(walkable))
+        end = grid.get_node_from_array(*rng.choice(walkable))
+        pairs.append((start, end))
+    return pairs
+
+
+def original_a_star(nodes: list, start, end) -> list:
+    """The former Enemy.a_star, with the nested list of every square the grid used to keep."""
+    count = 0
+    open_set = PriorityQueue()
+    open_set.put((0, count, start))
+    came_from = {}
+    g_score = {spot: float("inf") for row in nodes for spot in row}
+    g_score[start] = 0
+    f_score = {spot: float("inf") for row in nodes for spot in row}
+    f_score[start] = heuristic(start.get_pos(), end.get_pos(), start.get_weight())
+    open_set_hash = {start}
+
+    while not open_set.empty():
+        current = open_set.get()[2]
+        open_set_hash.remove(current)
+
+        if current == end:
+            return reconstruct_path(came_from, end)
+
+        for neighbor in current.neighbors:
+            temp_g_score = g_score[current] + current.weight
+
+            if temp_g_score < g_score[neighbor]:
+                came_from[neighbor] = current
+                g_score[neighbor] = temp_g_score
+                f_score[neighbor] = temp_g_score + heuristic(neighbor.get_pos(), end.get_pos(), neighbor.get_weight())
+                if neighbor not in open_set_hash:
+                    count += 1
+                    open_set.put((f_score[neighbor], count, neighbor))
+                    open_set_hash.add(neighbor)
+
+    return []
+
+
+def legacy_paths(nodes: list, pairs: list) -> list:
+    return [original_a_star(nodes, start, end) for start, end in pairs]
+
+
+def main() -> None:
+    pairs_per_level = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    pygame.init()
+    window = pygame.display.set_mode((SQUARE_SIZE, SQUARE_SIZE))
+
+    print(f"{'level':<8}{'before (ms)':>14}{'after (ms)':>14}{'speedup':>10}{'same paths':>12}")
+    for level_number, level_path in LEVELS.items():
+        grid = load_grid(window, level_path)
+        pairs = random_pairs(grid, pairs_per_level, level_number)
+
+        nodes = [[grid.get_node_from_array(row, col) for col in range(grid.size)] for row in range(grid.size)]
+        begin = time.perf_counter()
+        before = legacy_paths(nodes, pairs)
+        legacy_time = time.perf_counter() - begin
+
+        begin = time.perf_counter()
+        after = [grid.path_finder.find_path(start, end) for start, end in pairs]
+        finder_time = time.perf_counter() - begin
+
+        same = sum(old == new for old, new in zip(before, after))
+        print(f"{level_number:<8}{legacy_time / len(pairs) * 1000:>14.2f}{finder_time / len(pairs) * 1000:>14.2f}"
+              f"{legacy_time / finder_time:>9.1f}x{same:>7}/{len(pairs)}")
+
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Cost of ranking destination rooms with the room table of the grid against planning a path to each of them.
+
+Builds the room table of every level and loads it back from disk, then ranks every room from a random square, the
+way patrols and escaping civilians choose where to go, once by reading the table and once by planning a hierarchical
+path to a random square of every room.
+
+Usage:
+    python -m benchmarks.room_table [rankings]
+"""
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import numpy as np
+import pygame
+
+from benchmarks.grid_memory import load_grid
+from game.pathfinding.rooms import RoomTable
+from utils.constants import SQUARE_SIZE
+from utils.paths.maps_paths import LEVELS
+
+
+def rank_by_search(grid, targets: dict, start: int) -> list:
+    """Rooms sorted by the number of squares of the hierarchical path from a square to their target square."""
+    lengths = {}
+    for room_id, target in targets.items():
+        segments = grid.hierarchical_planner.plan(start, target)
+        if segments:
+            lengths[room_id] = sum(len(grid.path_finder.find_cells(first, last)) for first, last in segments)
+    return sorted(lengths, key=lengths.get)
+
+
+def main() -> None:
+    rankings = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    pygame.init()
+    window = pygame.display.set_mode((SQUARE_SIZE, SQUARE_SIZE))
+
+    print(f"{'level':<8}{'rooms':>7}{'build (ms)':>12}{'load (ms)':>11}{'table (ms)':>12}{'search (ms)':>13}")
+    for level_number, level_path in LEVELS.items():
+        grid = load_grid(window, level_path)
+        table_path = RoomTable.get_path(grid.border_map_path)
+        if os.path.exists(table_path):
+            os.remove(table_path)
+
+        begin = time.perf_counter()
+        RoomTable.load(grid, grid.border_map_path)
+        built = time.perf_counter() - begin
+        begin = time.perf_counter()
+        table = RoomTable.load(grid, grid.border_map_path)
+        loaded = time.perf_counter() - begin
+
+        rng = random.Random(level_number)
+        walkable = np.flatnonzero(~grid.barrier.ravel()).tolist()
+        starts = [rng.choice(walkable) for _ in range(rankings)]
+        rooms = table.rooms.tolist()
+        room = grid.room.ravel()
+        targets = {room_id: rng.choice(np.flatnonzero(~grid.barrier.ravel() & (room == room_id)).tolist())
+                   for room_id in rooms}
+
+        begin = time.perf_counter()
+        for start in starts:
+            table.rank(int(grid.room.flat[start]), rooms)
+        by_table = time.perf_counter() - begin
+        begin = time.perf_counter()
+        for start in starts:
+            rank_by_search(grid, targets, start)
+        by_search = time.perf_counter() - begin
+
+        print(f"{level_number:<8}{len(rooms):>7}{built * 1000:>12.2f}{loaded * 1000:>11.2f}"
+              f"{by_table / rankings * 1000:>12.3f}{by_search / rankings * 1000:>13.2f}")
+
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,15 +1,21 @@
 import math
+import random
 
 import pygame
 
 from game.entities.enemy import Enemy
 from game.map.grid import Grid
-from game.sprites.spritesheet import SpriteSheet
-from utils.constants import NPC_SIZE
+from utils.constants import ESCAPE_ROOMS, NPC_SIZE
+from utils.enums import PathMode, PathPriority, VisionEngine
 from utils.paths.assets_paths import ENEMY_ASSETS
 
 
 class Civilian(Enemy):
+    _sprite_sheet_source = (ENEMY_ASSETS, 10, 33, NPC_SIZE * 1.8)
+
+    # The wide cone of an escaping civilian is cheaper to sweep than to cast ray by ray
+    vision_engine = VisionEngine.SHADOWCAST
+
     def __init__(self,
                  position,
                  grid: Grid,
@@ -21,7 +27,6 @@ class Civilian(Enemy):
         #    1. ~~~~~~~~~~~~~~~~~~~~~~~~
         #    ~~        VISUALS        ~~
         #    ~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        self._sprite_sheet = SpriteSheet(ENEMY_ASSETS, 10, 33, NPC_SIZE * 1.8)
         self._animation_frames = 4
         self._animation_start = 130
         self._idle_frames = 2
@@ -53,13 +58,19 @@ class Civilian(Enemy):
 
             super().notified(player)
 
-            self.escape_node = self.grid.get_random_node()
-            while self.escape_node.get_id() == player_room:
+            # Escape to one of the nearest rooms, ranked by the room table of the grid instead of searching paths
+            table = self.grid.get_room_table()
+            rooms = [room for room in table.rank(current_room, table.rooms.tolist()) if room != player_room]
+            if rooms:
+                self.escape_node = self.grid.get_random_node_from_zone(random.choice(rooms[:ESCAPE_ROOMS]))
+            else:
                 self.escape_node = self.grid.get_random_node()
+                while self.escape_node.get_id() == player_room:
+                    self.escape_node = self.grid.get_random_node()
 
             self.previous_node = self.grid.get_node((self.x, self.y))
             # Fewer segments to counter greater speed
-            self.set_path(self.escape_node, 4)
+            self.set_path(self.escape_node, 4, PathMode.HIERARCHICAL)
 
     def update(self, **kwargs):
 
@@ -90,3 +101,6 @@ class Civilian(Enemy):
 
     def is_escaping(self):
         return self.escape_node is not None
+
+    def path_priority(self):
+        return PathPriority.ESCAPE if self.is_escaping() else PathPriority.PATROL
@@ -4,12 +4,14 @@ import pygame
 
 from game.entities.enemy import Enemy
 from game.map.grid import Grid
-from game.sprites.spritesheet import SpriteSheet
 from utils.constants import NPC_SIZE
+from utils.enums import PathMode, PathPriority
 from utils.paths.assets_paths import NPC_ASSETS
 
 
 class Guard(Enemy):
+    _sprite_sheet_source = (NPC_ASSETS, 10, 13, NPC_SIZE * 2)
+
     def __init__(self,
                  position,
                  grid: Grid,
@@ -21,7 +23,6 @@ class Guard(Enemy):
         #    1. ~~~~~~~~~~~~~~~~~~~~~~~~
         #    ~~ CHASING RELATED VARS  ~~
         #    ~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        self._sprite_sheet = SpriteSheet(NPC_ASSETS, 10, 13, NPC_SIZE * 2)
         self._animation_frames = 4
         self._animation_start = 100
         self._idle_frames = 2
@@ -70,8 +71,13 @@ class Guard(Enemy):
             self.vision_timer = max(0, self.vision_timer - 1)
             self.chase_node = self.grid.get_node((self.player.x, self.player.y))
 
-            # Simplified version to avoid slow turnings
-            self.set_simplified_path(self.chase_node, 4)
+            # The chase is planned again only when the player moves to another square, and not while standing on it
+            replan = self.next_point is None or self.end_node is None or not self.chase_node.compare_node(self.end_node)
+            if replan and not self.chase_node.compare_node(current_node):
+                # Simplified version to avoid slow turnings
+                self.set_simplified_path(self.chase_node, 4, PathMode.FLOW)
+            elif self.next_point is not None and self.has_reached(self.next_point):
+                self.set_next_point()
 
         else:
             self.speed = 1
@@ -86,3 +92,6 @@ class Guard(Enemy):
 
     def has_vision(self):
         return self.vision_timer > 0 and self.player is not None
+
+    def path_priority(self):
+        return PathPriority.CHASE if self.has_vision() else PathPriority.PATROL
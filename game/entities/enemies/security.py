@@ -3,6 +3,7 @@ import pygame
 
 from game.entities.enemy import Enemy
 from game.map.grid import Grid
+from utils.enums import PathMode, PathPriority
 
 
 class Security(Enemy):
@@ -26,7 +27,7 @@ class Security(Enemy):
         #    ~~~~~~~~~~~~~~~~~~~~~~~~~~~
         self.player = None
         self.chase_node = self.grid.spawn
-        self.set_path(self.chase_node)
+        self.set_path(self.chase_node, mode=PathMode.HIERARCHICAL)
         self.update()
 
         #    3. ~~~~~~~~~~~~~~~~~~~~~~~~
@@ -64,8 +65,10 @@ class Security(Enemy):
                 self.set_path(next_node)
             elif self.has_reached(self.next_point):
                 self.set_next_point()
-                # Simplified version to avoid slow turnings
-                self.set_simplified_path(self.chase_node, 2)
+                # The chase is planned again only when the player moves to another square
+                if self.next_point is None or not self.chase_node.compare_node(self.end_node):
+                    # Simplified version to avoid slow turnings
+                    self.set_simplified_path(self.chase_node, 2, PathMode.FLOW)
         else:
             if self.next_point is None or self.end_node.compare_node(current_node):
                 next_node = self.grid.get_random_node_from_zone(current_node.get_id())
@@ -77,3 +80,6 @@ class Security(Enemy):
 
     def player_known(self):
         return self.player is not None
+
+    def path_priority(self):
+        return PathPriority.CHASE if self.player_known() else PathPriority.PATROL
@@ -1,10 +1,10 @@
 import math
-import random
 
 import pygame
 
 from game.entities.enemy import Enemy
 from game.map.grid import Grid
+from utils.enums import PathMode, PathPriority
 
 
 class Sentinel(Enemy):
@@ -48,12 +48,10 @@ class Sentinel(Enemy):
             super().notified(player)
 
             if "sentinel" in player.exposer or "security" in player.exposer or self.within_reach((player.x, player.y)):
-                player_node = self.grid.get_node((player.x, player.y))
-                possible_nodes = player_node.neighbors
-                possible_nodes.append(player_node)
-                self.chase_node = random.choice(possible_nodes)
+                self.chase_node = self.grid.get_node((player.x, player.y))
                 self.previous_node = self.grid.get_node((self.x, self.y))
-                self.set_path(self.chase_node)
+                # The flow field shared with the other chasers leads onto the square of the player, where the chase ends
+                self.set_path(self.chase_node, mode=PathMode.FLOW)
 
     def update(self, **kwargs):
 
@@ -66,9 +64,11 @@ class Sentinel(Enemy):
             self.ray_reach = 6
             self.ray_radius = self.ray_reach * self.grid.gap
 
-            if self.next_point is None or self.chase_node.compare_node(current_node):
-                self.chase_node = None
+            # The chase is not over while its path is still waiting in the path scheduler
+            if (self.next_point is None and not self.waiting_path()) or self.chase_node.compare_node(current_node):
+                # The way back is requested while still chasing, so it replaces the waiting chase request
                 self.set_path(self.previous_node)
+                self.chase_node = None
 
         else:
             self.speed = 1
@@ -84,3 +84,6 @@ class Sentinel(Enemy):
 
     def is_chasing(self):
         return self.chase_node is not None
+
+    def path_priority(self):
+        return PathPriority.CHASE if self.is_chasing() else PathPriority.PATROL
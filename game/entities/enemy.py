@@ -9,10 +9,11 @@ from pygame import Surface
 import queue
 
 from game.map.grid import Grid
-from game.sprites.spritesheet import SpriteSheet
+from managers.resource_manager import ResourceManager
 from utils.algorithms import *
 from utils.auxiliar import *
 from utils.constants import *
+from utils.enums import PathMode, PathPriority, VisionEngine
 from utils.paths.assets_paths import ENEMY_ASSETS
 
 
@@ -21,6 +22,12 @@ from utils.paths.assets_paths import ENEMY_ASSETS
 # ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
 
 class Enemy(pygame.sprite.Sprite):
+    # Arguments of the shared sprite sheet of the enemy, overridden by each type of enemy
+    _sprite_sheet_source = (ENEMY_ASSETS, 10, 33, NPC_SIZE * 2)
+
+    # Engine used to cast the vision of the enemy, overridden by each type of enemy
+    vision_engine = VisionEngine.RAYCAST
+
     def __init__(self,
                  position: tuple[int, int],
                  movement_speed: float,
@@ -42,8 +49,9 @@ class Enemy(pygame.sprite.Sprite):
         self.image.fill((0, 0, 0))
         self.rect = self.image.get_rect()
         self.rect.center = (self.x, self.y)
+        self._flipped_image = self.image
 
-        self._sprite_sheet = SpriteSheet(ENEMY_ASSETS, 10, 33, NPC_SIZE * 2)
+        self._sprite_sheet = ResourceManager.load_sprite_sheet(*self._sprite_sheet_source, flipped=True)
         self._animation_frames = 4
         self._animation_start = 0
         self._idle_frames = 4
@@ -74,7 +82,10 @@ class Enemy(pygame.sprite.Sprite):
         self.start_node = None
         self.path_nodes = []
         self.path_points = []
+        self.path_segments = []
+        self.path_interpolation = 8
         self.next_point = None
+        self.path_scheduler = None
 
         # 4. ~~~~~~~~~~~~~~~~~~~~~~~~~~~
         #    ~~ RAY CASTING AND VISION ~~
@@ -115,10 +126,8 @@ class Enemy(pygame.sprite.Sprite):
         sprite_rect.centerx = self.rect.centerx
         sprite_rect.bottom = self.rect.bottom - 10
 
-        flipped_image = pygame.transform.flip(self.image, not self._looking_right, False)
-
         surface.blit(
-            source=flipped_image,
+            source=self.image if self._looking_right else self._flipped_image,
             dest=(sprite_rect.x - offset.x, sprite_rect.y - offset.y)
         )
 
@@ -168,6 +177,9 @@ class Enemy(pygame.sprite.Sprite):
 
                 self.delta_x = -math.cos(math.radians(self.angle)) * self.offset
                 self.delta_y = math.sin(math.radians(self.angle)) * self.offset
+        elif self.next_point is None and self.waiting_path():
+            # Nothing left to walk until the requested path is planned
+            self._is_moving = False
         else:
             self._is_moving = True
             iteration_count = 0
@@ -194,15 +206,12 @@ class Enemy(pygame.sprite.Sprite):
 
         if self._is_moving:
             self._current_frame %= self._animation_frames  # Ensure frame counter wraps around
-            self.image = self._sprite_sheet.get_sprite_by_number(self._animation_start + int(self._current_frame))
+            sprite_number = self._animation_start + int(self._current_frame)
         else:
             self._current_frame %= self._idle_frames  # Ensure frame counter wraps around
-            self.image = self._sprite_sheet.get_sprite_by_number(self._idle_start + int(self._current_frame))
-
-        ##############################
-        # CASTING RAYS
-        ##############################
-        self.cast()
+            sprite_number = self._idle_start + int(self._current_frame)
+        self.image = self._sprite_sheet.get_sprite_by_number(sprite_number)
+        self._flipped_image = self._sprite_sheet.get_sprite_by_number(sprite_number, flipped=True)
 
         # Update sprite
         self.rect.center = (self.x, self.y)
@@ -235,23 +244,97 @@ class Enemy(pygame.sprite.Sprite):
     #                               PATHFINDING                               #
     # ####################################################################### #
 
-    def pathfinding(self, end=None, interpolation=8, simplified=True):
+    def pathfinding(self, end=None, interpolation=8, simplified=True, mode=PathMode.ASTAR):
+        if self.path_scheduler is None:
+            self.plan_path(end, interpolation, simplified, mode)
+        elif end is not None or not self.path_scheduler.is_waiting(self):
+            # A random end is drawn when the request is served, so it never replaces a waiting request
+            self.path_scheduler.submit(self, self.path_priority(), end=end, interpolation=interpolation,
+                                       simplified=simplified, mode=mode)
+
+    def plan_path(self, end=None, interpolation=8, simplified=True, mode=PathMode.ASTAR, pool=None):
+        """
+        Plan a path to a node right away and start walking it.
+
+        Args:
+            end (Square, optional): The node the path leads to. A random one is chosen if None. Defaults to None.
+            interpolation (int, optional): The number of points per square of the path. Defaults to 8.
+            simplified (bool, optional): Whether to keep walking instead of turning on the spot. Defaults to True.
+            mode (PathMode, optional): The planner used to find the path. Defaults to PathMode.ASTAR.
+            pool (PathWorkerPool, optional): The worker pool the search is sent to if the path is not cached. The
+                current path is then walked until the new one is delivered. Defaults to None.
+        """
         try:
             self.set_start()
             if end is not None:
                 self.end_node = end
             else:
                 self.set_random_end()
-            self.set_intermediate_points(self.a_star(), interpolation, simplified)
+            # A request served after the enemy stepped onto its end leaves no path to walk
+            if self.start_node.compare_node(self.end_node):
+                return
+            self.path_segments = []
+            cached = None
+            if mode == PathMode.HIERARCHICAL:
+                nodes = self.hierarchical_path()
+            elif mode == PathMode.FLOW:
+                nodes = self.flow_path()
+            else:
+                cached = self.cached_path(mode, pool, interpolation=interpolation, simplified=simplified)
+                if cached is None:
+                    return
+                nodes = cached.get_nodes()
+            self.set_intermediate_points(nodes, interpolation, simplified, cached)
+        except Exception as e:
+            print(e)
+            print(self.path_nodes)
+
+    def receive_path(self, cells, start, end, mode, interpolation=8, simplified=True):
+        """
+        Store a path found by the worker pool in the path cache and start walking it.
+
+        Args:
+            cells (List[int]): The flat indices of the squares of the path, or an empty list if there is no path.
+            start (int): The index of the square the path starts from.
+            end (int): The index of the square the path leads to.
+            mode (PathMode): The planner that found the path.
+            interpolation (int, optional): The number of points per square of the path. Defaults to 8.
+            simplified (bool, optional): Whether to keep walking instead of turning on the spot. Defaults to True.
+        """
+        try:
+            size = self.grid.size
+            nodes = [self.grid.get_node_from_array(*divmod(cell, size)) for cell in cells]
+            cached = self.grid.path_cache.put(start, end, nodes, mode)
+            self.path_segments = []
+            self.set_intermediate_points(cached.get_nodes(), interpolation, simplified, cached)
         except Exception as e:
             print(e)
             print(self.path_nodes)
 
-    def set_intermediate_points(self, nodes, segments, simplified):
+    def waiting_path(self):
+        """
+        Check if the enemy is waiting for a path requested to the path scheduler.
+
+        Returns:
+            bool: True if a request of the enemy is waiting or being searched, False otherwise.
+        """
+        return self.path_scheduler is not None and self.path_scheduler.is_waiting(self)
+
+    def path_priority(self):
+        """
+        Get the priority of the path requests of the enemy in the path scheduler, overridden by each type of enemy.
+
+        Returns:
+            PathPriority: The priority of the requests.
+        """
+        return PathPriority.PATROL
+
+    def set_intermediate_points(self, nodes, segments, simplified, cached=None):
         if segments is None:
             segments = 8
+        self.path_interpolation = segments
         self.path_nodes = nodes
-        self.path_points = self.interpolate_points(segments)
+        self.path_points = self.interpolate_points(segments) if cached is None else self.cached_points(cached, segments)
         self.next_point = self.path_points[1]
         self.path_nodes.pop(0)
         self.path_points.pop(0)
@@ -275,25 +358,32 @@ class Enemy(pygame.sprite.Sprite):
                 end_node = self.grid.get_random_node()
             self.end_node = end_node
         else:
+            # Areas that cannot be reached from the current room are skipped for this draw only, without a search
+            table = self.grid.get_room_table()
+            skipped = []
             while True:
                 zone = self.areas.get()
                 end_node = self.grid.get_random_node_from_zone(zone)
-                if end_node is not None and not current_node.compare_node(end_node):
+                if end_node is not None and table.distance(current_node.get_id(), zone) == math.inf:
+                    skipped.append(zone)
+                elif end_node is not None and not current_node.compare_node(end_node):
                     self.end_node = end_node
                     self.areas.put(zone)
                     break
-                elif self.areas.empty():
+                if self.areas.empty():
                     end_node = self.grid.get_random_node()
                     while current_node.distance_to(end_node) < 3 * SQUARE_SIZE:
                         end_node = self.grid.get_random_node()
                     self.end_node = end_node
-                    return
+                    break
+            for zone in skipped:
+                self.areas.put(zone)
 
-    def set_path(self, node=None, segments=8):
-        self.pathfinding(end=node, interpolation=segments)
+    def set_path(self, node=None, segments=8, mode=PathMode.ASTAR):
+        self.pathfinding(end=node, interpolation=segments, mode=mode)
 
-    def set_simplified_path(self, node=None, segments=None):
-        self.pathfinding(node, segments, True)
+    def set_simplified_path(self, node=None, segments=None, mode=PathMode.ASTAR):
+        self.pathfinding(node, segments, True, mode)
 
     def set_next_point(self):
         try:
@@ -302,6 +392,8 @@ class Enemy(pygame.sprite.Sprite):
             self.path_points.pop(index)
         except Exception:
             self.next_point = None
+            if self.path_segments:
+                self.refine_next_segment()
 
     def has_reached(self, point, threshold: int = 1):
         return (point[0] - threshold <= self.x <= point[0] + threshold) and (
@@ -341,13 +433,164 @@ class Enemy(pygame.sprite.Sprite):
         return point_list
 
     def a_star(self):
+        """
+        Find the path from the start node to the end node with the path finder shared by every enemy of the grid.
+
+        Returns:
+            List[Square]: The squares of the path, or an empty list if the end node cannot be reached.
+        """
+        return self.grid.path_finder.find_path(self.start_node, self.end_node)
+
+    def flow_path(self):
+        """
+        Follow the flow field of the grid from the start node to the end node. The field is shared by every enemy of
+        the grid, and only computed again when it is asked for another end node, so it is meant for the enemies
+        chasing the player.
+
+        Returns:
+            List[Square]: The squares of the path, or an empty list if the end node cannot be reached.
+        """
+        return self.grid.flow_field.find_path(self.start_node, self.end_node)
+
+    def cached_path(self, mode=PathMode.ASTAR, pool=None, **request):
+        """
+        Get the path from the start node to the end node from the path cache of the grid, finding it if it is not there.
+
+        Args:
+            mode (PathMode, optional): The planner used to find the path. Defaults to PathMode.ASTAR.
+            pool (PathWorkerPool, optional): The worker pool the search is sent to if the path is not cached, instead
+                of finding it right away. Defaults to None.
+            **request: The arguments the path is delivered with to receive_path, when it is found by the pool.
+
+        Returns:
+            Optional[CachedPath]: The path, whose squares are empty if the end node cannot be reached, or None if it
+            has been sent to the pool.
+        """
+        size = self.grid.size
+        start = self.start_node.row * size + self.start_node.col
+        end = self.end_node.row * size + self.end_node.col
+        cached = self.grid.path_cache.get(start, end, mode)
+        if cached is None and pool is not None:
+            pool.submit(self, start, end, mode, **request)
+        elif cached is None:
+            nodes = self.a_star()
+            cached = self.grid.path_cache.put(start, end, nodes, mode)
+        return cached
+
+    def cached_points(self, cached, segments):
+        """
+        Get the interpolated points of a cached path, interpolating and storing them if they are not there.
+
+        Args:
+            cached (CachedPath): The path.
+            segments (int): The number of points per square.
+
+        Returns:
+            list: The interpolated points of the path.
+        """
+        points = cached.get_points(segments)
+        if points is None:
+            points = self.interpolate_points(segments)
+            # Paths too short to be interpolated are returned as they are, and not stored
+            if self.grid.path_cache.store_points and isinstance(points, list):
+                cached.set_points(segments, points)
+        return points
+
+    def _segment_path(self, segment):
+        size = self.grid.size
+        first, last = segment
+        cached = self.grid.path_cache.get(first, last, PathMode.ASTAR)
+        if cached is None:
+            nodes = self.grid.path_finder.find_path(self.grid.get_node_from_array(*divmod(first, size)),
+                                                    self.grid.get_node_from_array(*divmod(last, size)))
+            cached = self.grid.path_cache.put(first, last, nodes, PathMode.ASTAR)
+        return cached
+
+    def hierarchical_path(self):
+        """
+        Plan the rooms crossed to the end node, and find the squares of the first room only. The other rooms are left
+        in path_segments and refined as they are reached.
+
+        Returns:
+            List[Square]: The squares of the path through the first room, or an empty list if the end node cannot be
+            reached.
+        """
+        size = self.grid.size
+        segments = self.grid.hierarchical_planner.plan(self.start_node.row * size + self.start_node.col,
+                                                       self.end_node.row * size + self.end_node.col)
+        nodes = []
+        # A segment of a single square cannot be interpolated, so it is walked with the next one
+        while segments and len(nodes) < 2:
+            nodes.extend(self._segment_path(segments.pop(0)).get_nodes())
+        self.path_segments = segments
+        return nodes
+
+    def refine_next_segment(self):
+        """
+        Find the squares of the next room of a hierarchical path, and continue walking through them.
+        """
+        cached = self._segment_path(self.path_segments.pop(0))
+        nodes = cached.get_nodes()
+        if not nodes:
+            self.path_segments = []
+            return
+        self.path_nodes = nodes
+        if len(nodes) > 1:
+            self.path_points = self.cached_points(cached, self.path_interpolation)
+        else:
+            self.path_points = [nodes[0].get_pos()]
+        self.next_point = self.path_points[0]
+
+    def within_reach(self, position):
+        horizontal_distance = floor(abs(position[0] - self.rect.centerx)/self.grid.gap)
+        vertical_distance = floor(abs(position[1] - self.rect.centery)/self.grid.gap)
+        return horizontal_distance < self.ray_radius and vertical_distance < self.ray_reach
+
+    # ####################################################################### #
+    #                                 ROTATION                                #
+    # ####################################################################### #
+
+    def angle_to_point(self, point, show=False):
+        delta_x = point[0] - self.x
+        delta_y = point[1] - self.y
+        angle_rad = math.atan2(delta_y, delta_x)
+        angle_deg = math.degrees(angle_rad)
+        if show:
+            print('Original: ' + str(angle_deg))
+        if angle_deg < 0:
+            angle_final = -angle_deg
+        else:
+            angle_final = 360 - angle_deg
+        if show:
+            print('Transformed: ' + str(angle_final), '\n')
+        return angle_final
+
+    def is_facing(self, point):
+        threshold_angle = abs(self.rotation) + 1
+        angle_to_point_deg = self.angle_to_point(point)
+        angle_diff = (angle_to_point_deg - self.angle + 180) % 360 - 180
+        return abs(angle_diff) <= threshold_angle
+
+    def shortest_rotation(self, point):
+        target_angle = self.angle_to_point(point)
+        diff = (target_angle - self.angle + 360) % 360
+        return 1 if diff <= 180 else -1
+
+    def rotate(self, rotation):
+        self.angle = (self.angle + rotation) % 360
+
+    # ####################################################################### #
+    #                                DEPRECATED                               #
+    # ####################################################################### #
+
+    @deprecated("This method is too expensive, the PathFinder of the grid reuses its buffers between searches.")
+    def legacy_a_star(self):
         count = 0
         open_set = PriorityQueue()
         open_set.put((0, count, self.start_node))
         came_from = {}
-        g_score = {spot: float("inf") for row in self.grid.nodes for spot in row}
-        g_score[self.start_node] = 0
-        f_score = {spot: float("inf") for row in self.grid.nodes for spot in row}
+        g_score = {self.start_node: 0}
+        f_score = {}
         f_score[self.start_node] = heuristic(
             self.start_node.get_pos(),
             self.end_node.get_pos(),
@@ -365,7 +608,7 @@ class Enemy(pygame.sprite.Sprite):
             for neighbor in current.neighbors:
                 temp_g_score = g_score[current] + current.weight
 
-                if temp_g_score < g_score[neighbor]:
+                if temp_g_score < g_score.get(neighbor, float("inf")):
                     came_from[neighbor] = current
                     g_score[neighbor] = temp_g_score
                     f_score[neighbor] = temp_g_score + heuristic(neighbor.get_pos(), self.end_node.get_pos(),
@@ -377,16 +620,8 @@ class Enemy(pygame.sprite.Sprite):
 
         return []
 
-    def within_reach(self, position):
-        horizontal_distance = floor(abs(position[0] - self.rect.centerx)/self.grid.gap)
-        vertical_distance = floor(abs(position[1] - self.rect.centery)/self.grid.gap)
-        return horizontal_distance < self.ray_radius and vertical_distance < self.ray_reach
-
-    # ####################################################################### #
-    #                               RAY CASTING                               #
-    # ####################################################################### #
-
-    def cast(self):
+    @deprecated("This method is too expensive, the RayCaster casts every enemy at once.")
+    def cast_rays(self):
         ##############################
         # INITIALIZE VARIABLES
         ##############################
@@ -425,7 +660,7 @@ class Enemy(pygame.sprite.Sprite):
                 map_y = int(ray_y // self.grid.gap - (1 if up else 0))
                 if (
                         0 <= map_x < self.grid.size and
-                        0 <= map_y < self.grid.size and self.grid.nodes[map_x][map_y].is_barrier()
+                        0 <= map_y < self.grid.size and self.grid.barrier[map_x, map_y]
                 ):
                     ray_distance = self.ray_reach
                 else:
@@ -456,7 +691,7 @@ class Enemy(pygame.sprite.Sprite):
                 map_y = int(ray_y // self.grid.gap)
                 if (
                         0 <= map_x < self.grid.size and
-                        0 <= map_y < self.grid.size and self.grid.nodes[map_x][map_y].is_barrier()
+                        0 <= map_y < self.grid.size and self.grid.barrier[map_x, map_y]
                 ):
                     ray_distance = self.ray_reach
                 else:
@@ -486,43 +721,6 @@ class Enemy(pygame.sprite.Sprite):
         corner_list.append((contact_point, (self.x, self.y)))
         self.corners = corner_list
 
-    # ####################################################################### #
-    #                                 ROTATION                                #
-    # ####################################################################### #
-
-    def angle_to_point(self, point, show=False):
-        delta_x = point[0] - self.x
-        delta_y = point[1] - self.y
-        angle_rad = math.atan2(delta_y, delta_x)
-        angle_deg = math.degrees(angle_rad)
-        if show:
-            print('Original: ' + str(angle_deg))
-        if angle_deg < 0:
-            angle_final = -angle_deg
-        else:
-            angle_final = 360 - angle_deg
-        if show:
-            print('Transformed: ' + str(angle_final), '\n')
-        return angle_final
-
-    def is_facing(self, point):
-        threshold_angle = abs(self.rotation) + 1
-        angle_to_point_deg = self.angle_to_point(point)
-        angle_diff = (angle_to_point_deg - self.angle + 180) % 360 - 180
-        return abs(angle_diff) <= threshold_angle
-
-    def shortest_rotation(self, point):
-        target_angle = self.angle_to_point(point)
-        diff = (target_angle - self.angle + 360) % 360
-        return 1 if diff <= 180 else -1
-
-    def rotate(self, rotation):
-        self.angle = (self.angle + rotation) % 360
-
-    # ####################################################################### #
-    #                                DEPRECATED                               #
-    # ####################################################################### #
-
     @deprecated("This method is too expensive.")
     def update_mask(self, corners):
         ##############################
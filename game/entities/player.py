@@ -5,7 +5,7 @@ import pygame
 from pygame import Mask
 
 from game.map.grid import Grid
-from game.sprites.spritesheet import SpriteSheet
+from managers.resource_manager import ResourceManager
 from utils.auxiliar import get_direction, increase, decrease, has_changed
 from utils.constants import *
 from utils.enums import *
@@ -41,7 +41,7 @@ class Player(pygame.sprite.Sprite):
         self.y = y
         self.groups = []
         self.size = NPC_SIZE * 0.5
-        self._sprite_sheet = SpriteSheet(CHARACTER_ASSETS, 10, 13, NPC_SIZE * 2.2)
+        self._sprite_sheet = ResourceManager.load_sprite_sheet(CHARACTER_ASSETS, 10, 13, NPC_SIZE * 2.2, flipped=True)
         self._animation_frames = 4
         self._animation_start = 35
         self._animation_idle = 2
@@ -52,6 +52,7 @@ class Player(pygame.sprite.Sprite):
         self.image.fill((0, 0, 0))
         self.rect = self.image.get_rect()
         self.rect.center = (self.x, self.y)
+        self._flipped_image = self.image
 
         # 2. ~~~~~~~~~~~~~~~~~~~~~~~~~~~
         #    ~~ MOVEMENT AND ROTATION ~~
@@ -104,28 +105,25 @@ class Player(pygame.sprite.Sprite):
         # Calculate sprite position
         sprite_rect = self.image.get_rect(centerx=self.rect.centerx, bottom=self.rect.bottom - 10)
 
-        # Flip the image if needed
-        flipped_image = pygame.transform.flip(self.image, self._looking_right, False)
+        # Pick the flipped image if needed
+        image = self._flipped_image if self._looking_right else self.image
 
         # Draw the rotated sprite
-        surface.blit(flipped_image, (sprite_rect.x - offset.x, sprite_rect.y - offset.y))
+        surface.blit(image, (sprite_rect.x - offset.x, sprite_rect.y - offset.y))
 
     def update(self, **kwargs):
         # Variable initialization
         movement_option = kwargs.pop('movement_option', None)
-        player_mask = kwargs.pop('player_mask', None)
-        enemy_mask = kwargs.pop('enemy_mask', None)
+        observers = kwargs.pop('observers', None)
 
-        # Check if movement option, player mask, and enemy mask are provided and of correct types
+        # Check if movement option and observers are provided and of correct types
         if movement_option is not None and not isinstance(movement_option, Controls):
             raise TypeError("movement_option must be an instance of Controls enum")
-        if player_mask is not None and not isinstance(player_mask, Mask):
-            raise TypeError("player_mask must be an instance of Mask type")
-        if enemy_mask is not None and not isinstance(enemy_mask, Mask):
-            raise TypeError("enemy_mask must be an instance of Mask type")
+        if observers is not None and not isinstance(observers, list):
+            raise TypeError("observers must be an instance of list type")
 
         # ENEMY DETECTION AND HEALTH HANDLING
-        if self._is_detected(player_mask=player_mask, enemy_mask=enemy_mask):
+        if self._is_detected(observers=observers):
             self._health = decrease(self._health)
             self._recovering = False
             self._cooldown = 0
@@ -234,9 +232,11 @@ class Player(pygame.sprite.Sprite):
         if self._is_moving:
             self._current_frame += 0.5  # Increment frame counter by 0.5
             self._current_frame %= self._animation_frames  # Ensure frame counter wraps around
-            self.image = self._sprite_sheet.get_sprite_by_number(self._animation_start + int(self._current_frame))
-        elif not self._is_moving:
-            self.image = self._sprite_sheet.get_sprite_by_number(self._animation_idle)
+            sprite_number = self._animation_start + int(self._current_frame)
+        else:
+            sprite_number = self._animation_idle
+        self.image = self._sprite_sheet.get_sprite_by_number(sprite_number)
+        self._flipped_image = self._sprite_sheet.get_sprite_by_number(sprite_number, flipped=True)
 
     def add(self, *groups):
         for group in groups:
@@ -319,27 +319,31 @@ class Player(pygame.sprite.Sprite):
                 self.grid.visible_key = False
 
     @staticmethod
-    def _is_detected(player_mask: Mask, enemy_mask: Mask) -> bool:
+    def _is_detected(observers: list) -> bool:
         """
         Check if the player is detected by an enemy.
 
         Args:
-            player_mask (Mask): The mask representing the player's position.
-            enemy_mask (Mask): The mask representing the enemy's position.
+            observers (list): The enemies that see the player.
 
         Returns:
             bool: True if the player is detected by the enemy, False otherwise.
         """
-        return (
-                player_mask is not None and
-                enemy_mask is not None and
-                player_mask.overlap_area(enemy_mask, (0, 0)) > 0
-        )
+        return observers is not None and len(observers) > 0
 
     # ####################################################################### #
     #                                DEPRECATED                               #
     # ####################################################################### #
 
+    @deprecated("Detection is now computed geometrically by game.vision.detection.")
+    def _is_detected_by_mask(self, player_mask: Mask, enemy_mask: Mask) -> bool:
+        """return (
+                player_mask is not None and
+                enemy_mask is not None and
+                player_mask.overlap_area(enemy_mask, (0, 0)) > 0
+        )"""
+        raise NotImplemented
+
     @deprecated("This method is no longer used.")
     def picked_up_key(self):
         """if self._picked_up_key:
@@ -6,12 +6,18 @@ from game.entities.enemies.guard import Guard
 from game.entities.enemies.civilian import Civilian
 from game.entities.enemies.sentinel import Sentinel
 from game.entities.enemies.security import Security
+from game.pathfinding.scheduler import PathScheduler
+from game.pathfinding.workers import PathWorkerPool
+from utils.constants import PATH_WORKERS
+from game.vision.raycaster import RayCaster
 
 
 class Enemies(pygame.sprite.Group):
     def __init__(self) -> None:
         super().__init__()
         self._player = None
+        self._raycaster = None
+        self._scheduler = None
 
     def set_player(self, player: Player) -> None:
         self._player = player
@@ -21,6 +27,27 @@ class Enemies(pygame.sprite.Group):
             for sprite in self.sprites():
                 sprite.notified(self._player)
 
+    def cast(self) -> None:
+        """
+        Cast the vision of every enemy at once.
+        """
+        if self._raycaster is not None:
+            self._raycaster.cast(self.sprites())
+
+    def deliver(self) -> None:
+        """
+        Hand the paths found off the main thread to their enemies.
+        """
+        if self._scheduler is not None:
+            self._scheduler.deliver()
+
+    def plan(self) -> None:
+        """
+        Plan the paths requested by the enemies, within the time budget of the frame.
+        """
+        if self._scheduler is not None:
+            self._scheduler.run()
+
     def remove(self, enemy: Enemy = None) -> None:
         if enemy:
             enemy.kill()
@@ -45,6 +72,12 @@ class Enemies(pygame.sprite.Group):
             List of spawned Enemy objects.
         """
         self.remove_all()
+        if self._raycaster is None or self._raycaster.grid is not grid:
+            self._raycaster = RayCaster(grid)
+        self._raycaster.forget()
+        if self._scheduler is not None:
+            self._scheduler.clear()
+        self._scheduler = PathScheduler(pool=PathWorkerPool(grid, PATH_WORKERS) if PATH_WORKERS > 0 else None)
 
         enemies = []
 
@@ -81,6 +114,10 @@ class Enemies(pygame.sprite.Group):
                 enemy = Security((x, y), grid, win)
                 enemies.append(enemy)
 
+        # Paths are planned on the spot while spawning, and through the scheduler afterwards
+        for enemy in enemies:
+            enemy.path_scheduler = self._scheduler
+
         return enemies
 
     @staticmethod
@@ -7,6 +7,7 @@ from typing_extensions import deprecated
 from game.entities.enemy import Enemy
 from game.entities.player import Player
 from game.map.grid import Grid
+from utils.constants import LIGHT_COLOR, SHADOW_COLOR
 
 
 class Camera(pygame.sprite.Group):
@@ -26,6 +27,7 @@ class Camera(pygame.sprite.Group):
         self._internal_size = pygame.math.Vector2(self.surface.get_width(), self.surface.get_height())
         self._internal_surface = pygame.Surface(self._internal_size)
         self._internal_rectangle = self._internal_surface.get_rect(center=self.center)
+        self._scaled_surface = None
         self._zoom_level = 1
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
@@ -42,11 +44,12 @@ class Camera(pygame.sprite.Group):
 
         # Enemy-related attributes
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~
+        # The shadow surface is reused every frame: it is filled with the shadow colour and the areas seen by the
+        # enemies are cleared to full transparency, so it can be blitted directly over the map.
         win = pygame.display.get_surface()
-        self._enemy_surface = pygame.Surface((win.get_width(), win.get_height()), pygame.SRCALPHA)
+        self._shadow_surface = pygame.Surface((win.get_width(), win.get_height()), pygame.SRCALPHA)
         self._enemy_untreated_vertices = []
         self._enemy_untreated_positions = []
-        self._enemy_mask = pygame.mask.from_surface(self._enemy_surface)
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
     def _calculate_enemy_mask(self, enemy: Enemy, vertices: List[int]) -> None:
@@ -59,36 +62,19 @@ class Camera(pygame.sprite.Group):
         position_y = int(enemy.y) - self.offset[1]
 
         pygame.draw.rect(
-            self._enemy_surface,
-            (255, 255, 255, 255),
+            self._shadow_surface,
+            LIGHT_COLOR,
             pygame.Rect(position_x - enemy.size / 2, position_y - enemy.size / 2, enemy.size, enemy.size)
         )
 
         if len(vertices) > 2:
-            pygame.draw.polygon(self._enemy_surface, (255, 255, 255), vertices)
+            pygame.draw.polygon(self._shadow_surface, LIGHT_COLOR, vertices)
 
     def save_enemy_mask(self, enemy: Enemy, vertices: List[int]) -> None:
         if enemy.in_range(self._internal_surface, self._boundary.center, enemy.ray_radius):
             self._enemy_untreated_vertices.append(vertices)
             self._enemy_untreated_positions.append(enemy)
 
-    def return_enemy_mask(self) -> Surface:
-        return self._enemy_mask
-
-    def _calculate_player_mask(self, player: Player) -> pygame.mask.Mask:
-        mask_surface = pygame.Surface((self.surface.get_width(), self.surface.get_height()), pygame.SRCALPHA)
-        player_rect = (
-            player.rect.x - self.offset[0],
-            player.rect.y - self.offset[1],
-            player.rect.width,
-            player.rect.height
-        )
-        pygame.draw.rect(mask_surface, (255, 255, 255, 255), player_rect)
-        return pygame.mask.from_surface(mask_surface)
-
-    def return_player_mask(self, player: Player) -> pygame.mask.Mask:
-        return self._calculate_player_mask(player)
-
     def draw(self, *args, **kwargs):
         player = kwargs.get('player')
         if player is not None and not isinstance(player, Player):
@@ -121,9 +107,8 @@ class Camera(pygame.sprite.Group):
         else:
             print('No Grid has reached the camera.')
 
-        # Prepare enemy surface
-        win = pygame.display.get_surface()
-        self._enemy_surface = pygame.Surface((win.get_width(), win.get_height()), pygame.SRCALPHA)
+        # Prepare shadow surface
+        self._shadow_surface.fill(SHADOW_COLOR)
 
         # Calculate enemy masks
         for vertices, enemy in zip(self._enemy_untreated_vertices, self._enemy_untreated_positions):
@@ -133,24 +118,18 @@ class Camera(pygame.sprite.Group):
         self._enemy_untreated_vertices = []
         self._enemy_untreated_positions = []
 
-        # Create enemy mask
-        self._enemy_mask = pygame.mask.from_surface(self._enemy_surface)
-
         # Draw player rectangle
         if player:
             position_x = int(player.x) - self.offset[0]
             position_y = int(player.y) - self.offset[1]
             pygame.draw.rect(
-                self._enemy_surface,
-                (255, 255, 255, 255),
+                self._shadow_surface,
+                LIGHT_COLOR,
                 pygame.Rect(position_x, position_y, player.size * 2, player.size * 2)
             )
 
-        # Blend enemy mask with internal surface
-        if self._enemy_mask is not None:
-            self._internal_surface.blit(
-                pygame.mask.from_surface(
-                    self._enemy_surface).to_surface(setcolor=None, unsetcolor=(0, 0, 0, 100)), (0, 0))
+        # Blend shadow with internal surface
+        self._internal_surface.blit(self._shadow_surface, (0, 0))
 
         # Draw the grid again (if needed)
         kwargs['float'] = False
@@ -169,9 +148,17 @@ class Camera(pygame.sprite.Group):
             grid.draw(**kwargs)
 
         # Scale and blit the internal surface to the main surface
-        scaled_surface = pygame.transform.scale(self._internal_surface, self._internal_size * self._zoom_level)
-        scaled_rectangle = scaled_surface.get_rect(center=self.center)
-        self.surface.blit(scaled_surface, scaled_rectangle)
+        if self._zoom_level == 1:
+            self.surface.blit(self._internal_surface, self._internal_rectangle)
+            return
+
+        scaled_size = self._internal_size * self._zoom_level
+        scaled_size = (int(scaled_size.x), int(scaled_size.y))
+        if self._scaled_surface is None or self._scaled_surface.get_size() != scaled_size:
+            self._scaled_surface = pygame.Surface(scaled_size)
+        pygame.transform.scale(self._internal_surface, scaled_size, self._scaled_surface)
+        scaled_rectangle = self._scaled_surface.get_rect(center=self.center)
+        self.surface.blit(self._scaled_surface, scaled_rectangle)
 
     def _zoom(self) -> None:
         """
@@ -231,6 +218,24 @@ class Camera(pygame.sprite.Group):
         return horizontal_distance < (self._internal_surface.get_width() // 2 + padding) and \
             vertical_distance < (self._internal_surface.get_height() // 2 + padding)
 
+    @deprecated('Detection is now computed geometrically by game.vision.detection')
+    def return_enemy_mask(self) -> Surface:
+        """return self._enemy_mask"""
+        raise NotImplemented
+
+    @deprecated('Detection is now computed geometrically by game.vision.detection')
+    def return_player_mask(self, player: Player) -> pygame.mask.Mask:
+        """mask_surface = pygame.Surface((self.surface.get_width(), self.surface.get_height()), pygame.SRCALPHA)
+        player_rect = (
+            player.rect.x - self.offset[0],
+            player.rect.y - self.offset[1],
+            player.rect.width,
+            player.rect.height
+        )
+        pygame.draw.rect(mask_surface, (255, 255, 255, 255), player_rect)
+        return pygame.mask.from_surface(mask_surface)"""
+        raise NotImplemented
+
     @deprecated('This method has been replaced')
     def _update(self):
         """if self.surface_mask is not None:
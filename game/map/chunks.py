@@ -0,0 +1,209 @@
+import math
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pygame
+
+from game.map.tiles import TileTable
+from utils.constants import CHUNK_SIZE, GRID_BACKGROUND
+
+
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+#                                      TILE CHUNKS CLASS                                        #
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+
+class TileChunks:
+    """
+    Pre-rendered static tile layers of a grid.
+
+    Every layer (floor, middle and floating tiles) is split into square chunks of CHUNK_SIZE squares per side. A
+    chunk is baked into a surface the first time it becomes visible and is reused on every following frame, so drawing
+    a layer costs a handful of blits. Only the most recently used chunks are kept in memory.
+
+    The middle tiles of the squares holding an animated tile are left out of the chunks, since they change every
+    frame. The grid draws those squares on top of the chunks.
+
+    Attributes:
+        grid (Grid): The grid whose tiles are rendered.
+        chunk_size (int): The number of squares per side of each chunk.
+        animated (np.ndarray): Whether each square holds an animated tile and must be drawn every frame.
+    """
+
+    FLOOR = TileTable.FLOOR_LAYER
+    MIDDLE = TileTable.MIDDLE_LAYER
+    FLOATING = TileTable.FLOATING_LAYER
+
+    def __init__(self, grid, chunk_size: int = CHUNK_SIZE):
+        """
+        Initialize the chunks of a grid. No surface is baked until the chunk is drawn.
+
+        Args:
+            grid (Grid): The grid whose tiles are rendered.
+            chunk_size (int, optional): The number of squares per side of each chunk. Defaults to CHUNK_SIZE.
+        """
+        self.grid = grid
+        self.chunk_size = chunk_size
+        self.chunks_per_side = math.ceil(grid.size / chunk_size)
+        self.animated = np.zeros((grid.size, grid.size), dtype=bool)
+
+        self._pixels = chunk_size * grid.gap
+        self._surfaces = OrderedDict()
+        self._capacity = 0
+
+        self._classify()
+
+    # ####################################################################### #
+    #                               CLASSIFICATION                            #
+    # ####################################################################### #
+
+    def _layer_tiles(self, row: int, col: int, layer: int) -> List[int]:
+        """
+        Select the static tiles of a square that belong to the given layer.
+
+        Args:
+            row (int): The row index of the square.
+            col (int): The column index of the square.
+            layer (int): The layer to draw.
+
+        Returns:
+            List[int]: The tile IDs to draw, from bottom to top.
+        """
+        if layer == self.MIDDLE and self.animated[row, col]:
+            return []
+        return self.grid.layer_tiles[layer, row, col, :self.grid.layer_count[layer, row, col]].tolist()
+
+    def _classify(self) -> None:
+        """
+        Find which chunks hold tiles of each layer and which squares hold animated tiles.
+        """
+        grid = self.grid
+        self.animated = grid.animated_layer >= 0
+        occupied = grid.layer_count > 0
+        occupied[self.MIDDLE] &= ~self.animated
+        self._occupied = [self._occupied_chunks(cells) for cells in occupied]
+
+    def _occupied_chunks(self, cells: np.ndarray) -> np.ndarray:
+        padded_size = self.chunks_per_side * self.chunk_size
+        padded = np.zeros((padded_size, padded_size), dtype=bool)
+        padded[:cells.shape[0], :cells.shape[1]] = cells
+        return padded.reshape(self.chunks_per_side, self.chunk_size, self.chunks_per_side, self.chunk_size).any(axis=(1, 3))
+
+    # ####################################################################### #
+    #                                   BAKING                                #
+    # ####################################################################### #
+
+    def _new_surface(self, layer: int) -> pygame.Surface:
+        surface = pygame.Surface((self._pixels, self._pixels))
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        surface.fill(GRID_BACKGROUND)
+        if layer != self.FLOOR:
+            # Black is the transparent colour of every tile of the sprite sheet
+            surface.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+        return surface
+
+    def _draw_square(self, surface: pygame.Surface, layer: int, row: int, col: int, origin: Tuple[int, int]) -> None:
+        sprite_sheet = self.grid.sprite_sheet
+        if sprite_sheet is None:
+            return
+
+        position = ((row - origin[0]) * self.grid.gap, (col - origin[1]) * self.grid.gap)
+        for sprite_id in self._layer_tiles(row, col, layer):
+            surface.blit(sprite_sheet.get_sprite_by_number(sprite_id), position)
+
+    def _bake(self, layer: int, chunk_row: int, chunk_col: int) -> pygame.Surface:
+        """
+        Render every static tile of a chunk into a new surface.
+
+        Args:
+            layer (int): The layer to render.
+            chunk_row (int): The row index of the chunk.
+            chunk_col (int): The column index of the chunk.
+
+        Returns:
+            pygame.Surface: The rendered chunk.
+        """
+        surface = self._new_surface(layer)
+        origin = (chunk_row * self.chunk_size, chunk_col * self.chunk_size)
+        for row in range(origin[0], min(origin[0] + self.chunk_size, self.grid.size)):
+            for col in range(origin[1], min(origin[1] + self.chunk_size, self.grid.size)):
+                self._draw_square(surface, layer, row, col, origin)
+        return surface
+
+    def _get(self, layer: int, chunk_row: int, chunk_col: int) -> Optional[pygame.Surface]:
+        if not self._occupied[layer][chunk_row, chunk_col]:
+            return None
+
+        key = (layer, chunk_row, chunk_col)
+        surface = self._surfaces.get(key)
+        if surface is None:
+            surface = self._surfaces[key] = self._bake(layer, chunk_row, chunk_col)
+            while len(self._surfaces) > self._capacity:
+                self._surfaces.popitem(last=False)
+        else:
+            self._surfaces.move_to_end(key)
+        return surface
+
+    def refresh(self, row: int, col: int) -> None:
+        """
+        Render again a square whose tiles have changed.
+
+        Args:
+            row (int): The row index of the square.
+            col (int): The column index of the square.
+        """
+        chunk_row, chunk_col = row // self.chunk_size, col // self.chunk_size
+        origin = (chunk_row * self.chunk_size, chunk_col * self.chunk_size)
+
+        self.animated[row, col] = self.grid.animated_layer[row, col] >= 0
+
+        for layer in (self.FLOOR, self.MIDDLE, self.FLOATING):
+            if self._layer_tiles(row, col, layer):
+                self._occupied[layer][chunk_row, chunk_col] = True
+            surface = self._surfaces.get((layer, chunk_row, chunk_col))
+            if surface is None:
+                continue
+            area = pygame.Rect((row - origin[0]) * self.grid.gap, (col - origin[1]) * self.grid.gap,
+                               self.grid.gap, self.grid.gap)
+            surface.fill(GRID_BACKGROUND, area)
+            self._draw_square(surface, layer, row, col, origin)
+
+    def release(self) -> None:
+        """
+        Free every baked surface. They are baked again the next time they are drawn.
+        """
+        self._surfaces.clear()
+
+    # ####################################################################### #
+    #                                   DRAW                                  #
+    # ####################################################################### #
+
+    def _visible_chunks(self, start: float, length: int) -> range:
+        first = max(0, math.floor(start / self._pixels))
+        last = min(self.chunks_per_side, math.ceil((start + length) / self._pixels))
+        return range(first, max(first, last))
+
+    def draw(self, surface: pygame.Surface, offset: pygame.math.Vector2, layer: int) -> None:
+        """
+        Draw the chunks of a layer that intersect the given surface.
+
+        Args:
+            surface (pygame.Surface): The surface to draw on.
+            offset (pygame.math.Vector2): The position of the top-left corner of the surface in the map.
+            layer (int): The layer to draw.
+        """
+        width, height = surface.get_size()
+
+        # Keep the chunks that can cover the surface, and a margin of one chunk around them, for every layer
+        around = (math.ceil(width / self._pixels) + 2) * (math.ceil(height / self._pixels) + 2)
+        self._capacity = max(self._capacity, 3 * around)
+
+        chunk_rows = self._visible_chunks(offset.x, width)
+        chunk_cols = self._visible_chunks(offset.y, height)
+        for chunk_row in chunk_rows:
+            for chunk_col in chunk_cols:
+                position = (chunk_row * self._pixels, chunk_col * self._pixels)
+                chunk = self._get(layer, chunk_row, chunk_col)
+                if chunk is not None:
+                    surface.blit(chunk, (position[0] - offset.x, position[1] - offset.y))
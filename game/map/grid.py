@@ -2,15 +2,67 @@ import csv
 import random
 from typing import List, Optional
 
+import numpy as np
 import pygame
 from pygame import Surface
 
+from game.map.chunks import TileChunks
 from game.map.square import Square
-from game.sprites.spritesheet import SpriteSheet
-from utils.constants import GRID_BACKGROUND, MAP, TILE_MAP, SQUARE_SIZE
+from game.map.tiles import TileTable
+from game.map.walls import WallIndex
+from game.pathfinding.astar import PathFinder
+from game.pathfinding.cache import PathCache
+from game.pathfinding.flow import FlowField
+from game.pathfinding.hierarchical import HierarchicalPlanner
+from game.pathfinding.rooms import RoomTable
+from managers.resource_manager import ResourceManager
+from utils.constants import GRID_BACKGROUND, MAP, NEIGHBOUR_OFFSETS, TILE_MAP, SQUARE_SIZE, WEIGHT
 from utils.paths.assets_paths import UI_ICONS
 
 
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+#                                       CELL SET CLASS                                          #
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+
+class CellSet:
+    """
+    A set of flat cell indices with constant time insertion, removal and uniform sampling.
+
+    Attributes:
+        cells (list): The indices in the set, in no particular order.
+    """
+
+    __slots__ = ('cells', '_positions')
+
+    def __init__(self):
+        self.cells = []
+        self._positions = {}
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __contains__(self, index: int) -> bool:
+        return index in self._positions
+
+    def add(self, index: int) -> None:
+        if index not in self._positions:
+            self._positions[index] = len(self.cells)
+            self.cells.append(index)
+
+    def discard(self, index: int) -> None:
+        position = self._positions.pop(index, None)
+        if position is None:
+            return
+        # Move the last index into the freed position
+        last = self.cells.pop()
+        if last != index:
+            self.cells[position] = last
+            self._positions[last] = position
+
+    def choice(self) -> int:
+        return random.choice(self.cells)
+
+
 # ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
 #                                         GRID CLASS                                            #
 # ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
@@ -21,6 +73,9 @@ class Grid:
         """
         Initialize a Grid object.
 
+        The state of every square is stored in NumPy arrays indexed by (row, col). Square objects are only views
+        over these arrays and are created on demand.
+
         Args:
             size (tuple): Size of the grid.
             win (pygame.Surface): Pygame window surface.
@@ -38,10 +93,18 @@ class Grid:
         self.size = size
         self.win = win
         self.font = pygame.font.SysFont('Arial', self.gap)
-        self.nodes = []
         self.hover = None
+        self.layout_version = 0
+        self.chunks = None
+        self.walls = None
+        self.tile_table = TileTable(ss_columns * ss_rows)
 
         self._create_array()
+        self.path_finder = PathFinder(self)
+        self.hierarchical_planner = HierarchicalPlanner(self)
+        self.path_cache = PathCache(self)
+        self.flow_field = FlowField(self)
+        self._room_table = None
 
         # ──────── SPAWN POINT ──────── #
         self.spawn = None
@@ -50,13 +113,15 @@ class Grid:
         self.visible_key = True
 
         # ──────── READ MAPS ──────── #
-        self.read_border_map(MAP if border_map_path is None else border_map_path)
+        self.border_map_path = MAP if border_map_path is None else border_map_path
+        self.read_border_map(self.border_map_path)
         self.read_tile_map(TILE_MAP if tile_map_path is None else tile_map_path)
         self.read_tile_map(objects_map_path) if objects_map_path is not None else None
 
         # ──────── SPRITE SHEET ──────── #
-        self.sprite_sheet = SpriteSheet(sprite_sheet_path, ss_columns, ss_rows, SQUARE_SIZE) if tile_map_path is not None else None
-        self.key_sheet = SpriteSheet(UI_ICONS, 10, 9, SQUARE_SIZE)
+        self.sprite_sheet = ResourceManager.load_sprite_sheet(sprite_sheet_path, ss_columns, ss_rows, SQUARE_SIZE) if tile_map_path is not None else None
+        self.key_sheet = ResourceManager.load_sprite_sheet(UI_ICONS, 10, 9, SQUARE_SIZE)
+        self.chunks = TileChunks(self)
 
         # ──────── UPDATE ──────── #
         self._update_array()
@@ -66,20 +131,75 @@ class Grid:
     # ####################################################################### #
 
     def _create_array(self):
-        self.nodes = []
-        for i in range(self.size):
-            self.nodes.append([])
-            for j in range(self.size):
-                node = Square(i, j, self.gap, self.size, self.size, 0)
-                if node.is_border():
-                    node.make_barrier()
-                self.nodes[i].append(node)
+        shape = (self.size, self.size)
+
+        # Square views, allocated the first time each cell is requested
+        self._squares = [None] * (self.size * self.size)
+
+        # Walkable cells, as a whole and by room
+        self._walkable = CellSet()
+        self._rooms = {}
+
+        # Square identification and characteristics
+        self.barrier = np.zeros(shape, dtype=bool)
+        self.room = np.full(shape, -1, dtype=np.int16)
+        self.weight = np.zeros(shape, dtype=np.int16)
+        self.tiles = np.full(shape + (0,), -1, dtype=np.int16)
+        self.tile_count = np.zeros(shape, dtype=np.uint8)
+
+        # Tile layers split into the floor, middle and floating layers of TileTable
+        self.layer_tiles = np.full((3,) + shape + (0,), -1, dtype=np.int16)
+        self.layer_count = np.zeros((3,) + shape, dtype=np.uint8)
+        self.animated_layer = np.full(shape, -1, dtype=np.int8)
+
+        # Neighbours and barriers, one bit per entry of NEIGHBOUR_OFFSETS
+        self.neighbour_mask = np.zeros(shape, dtype=np.uint8)
+        self.barrier_mask = np.zeros(shape, dtype=np.uint8)
+
+        # Additional properties
+        self.keys = np.zeros(shape, dtype=bool)
+        self.exits = np.zeros(shape, dtype=bool)
+
+        # Animation attributes
+        self.current_frame = np.zeros(shape, dtype=np.int8)
+        self.pass_frame = np.full(shape, Square._delay_frame, dtype=np.int8)
+
+        # Key animation attributes
+        self.key_offset = np.zeros(shape, dtype=np.float32)
+        self.key_speed = np.full(shape, 0.25, dtype=np.float32)
+
+        self.barrier[self._border()] = True
+
+    def _border(self) -> np.ndarray:
+        border = np.ones((self.size, self.size), dtype=bool)
+        border[1:-1, 1:-1] = False
+        return border
 
     def _update_array(self):
-        for row in self.nodes:
-            for spot in row:
-                spot.update_neighbors(self)
-                spot.surrounding_barrier(self)
+        for row, col in np.argwhere(self._border() & ~self.barrier).tolist():
+            self._set_barrier(row, col)
+
+        free = np.pad(~self.barrier, 1, constant_values=False)
+        blocked = np.pad(self.barrier, 1, constant_values=False)
+
+        def shifted(padded, d_row, d_col):
+            return padded[1 + d_row:1 + d_row + self.size, 1 + d_col:1 + d_col + self.size]
+
+        # Every barrier adds weight to the squares around it
+        self.weight = (WEIGHT * sum(shifted(blocked, d_row, d_col) for d_row, d_col in NEIGHBOUR_OFFSETS[:4])).astype(np.int16)
+
+        self.neighbour_mask = np.zeros((self.size, self.size), dtype=np.uint8)
+        self.barrier_mask = np.zeros((self.size, self.size), dtype=np.uint8)
+        for bit, (d_row, d_col) in enumerate(NEIGHBOUR_OFFSETS):
+            accessible = shifted(free, d_row, d_col)
+            if d_row != 0 and d_col != 0:
+                # Diagonals cannot cut the corner of a barrier
+                accessible = accessible & shifted(free, d_row, 0) & shifted(free, 0, d_col)
+            self.neighbour_mask |= accessible.astype(np.uint8) << bit
+            self.barrier_mask |= shifted(blocked, d_row, d_col).astype(np.uint8) << bit
+
+        self.walls = WallIndex(self.barrier, self.gap)
+        self.layout_version += 1
 
     def draw(self, **kwargs):
         surface = kwargs.pop('internal_surface', None)
@@ -107,27 +227,66 @@ class Grid:
         if only_floor:
             surface.fill(GRID_BACKGROUND)
 
-        for row in self.nodes:
-            for spot in row:
-                if spot.is_key and self.visible_key:
-                    key = self.key_sheet
-                else:
-                    key = None
-                spot.draw(
-                    win=surface,
-                    sprite_sheet=self.sprite_sheet,
-                    offset=offset,
-                    only_float=only_float,
-                    only_floor=only_floor,
-                    key_sheet=key
-                )
-                if spot.is_border():
-                    spot.make_barrier()
-
-    def add(self, group):
-        for row in self.nodes:
-            for node in row:
-                node.add(group)
+        if offset is None:
+            return
+
+        if only_floor:
+            layer = TileChunks.FLOOR
+        elif only_float:
+            layer = TileChunks.FLOATING
+        else:
+            layer = TileChunks.MIDDLE
+
+        # Static tiles come from the pre-rendered chunks
+        self.chunks.draw(surface, offset, layer)
+
+        # Animated squares and the key are drawn on top, one square at a time
+        rows, cols = self.get_visible_range(offset, surface.get_width(), surface.get_height())
+        dynamic = np.zeros((len(rows), len(cols)), dtype=bool)
+        if layer == TileChunks.MIDDLE:
+            dynamic |= self.chunks.animated[rows.start:rows.stop, cols.start:cols.stop]
+        if self.visible_key and not only_float:
+            dynamic |= self.keys[rows.start:rows.stop, cols.start:cols.stop]
+
+        for row, col in (np.argwhere(dynamic) + (rows.start, cols.start)).tolist():
+            if self.keys[row, col] and self.visible_key:
+                key = self.key_sheet
+            else:
+                key = None
+            self._square(row, col).draw(
+                win=surface,
+                sprite_sheet=self.sprite_sheet,
+                offset=offset,
+                only_float=only_float,
+                only_floor=only_floor,
+                key_sheet=key
+            )
+
+    def get_visible_range(self, offset: pygame.math.Vector2, width: int, height: int) -> tuple:
+        """
+        Get the rows and columns of the squares that may be seen through a view of the map.
+
+        The range includes one extra square on every side, so it covers everything Square.draw would draw.
+
+        Args:
+            offset (pygame.math.Vector2): The position of the top-left corner of the view in the map.
+            width (int): The width of the view in pixels.
+            height (int): The height of the view in pixels.
+
+        Returns:
+            tuple: The range of rows and the range of columns of the visible squares.
+        """
+        first_row = max(0, int(offset.x // self.gap) - 1)
+        first_col = max(0, int(offset.y // self.gap) - 1)
+        last_row = min(self.size, int((offset.x + width) // self.gap) + 2)
+        last_col = min(self.size, int((offset.y + height) // self.gap) + 2)
+        return range(first_row, max(first_row, last_row)), range(first_col, max(first_col, last_col))
+
+    def release(self) -> None:
+        """
+        Free the pre-rendered chunks of the map. They are rendered again when the grid is drawn.
+        """
+        self.chunks.release()
 
     # ####################################################################### #
     #                                    MAP                                  #
@@ -147,16 +306,16 @@ class Grid:
                 # Split the line into characters
                 characters = list(line[0].strip())
                 # Append the characters to the lines list
-                lines.append(characters)
+                lines.append(characters[:self.size])
+
+        # Each line of the file is a column of the grid
+        characters = np.array(lines[:self.size]).T
+        rooms = np.char.isnumeric(characters)
+
+        self.barrier = ~rooms
+        self.room[rooms] = characters[rooms].astype(np.int16)
 
-            for y, row in enumerate(self.nodes):
-                for x, node in enumerate(row):
-                    if lines[x][y] == 'X':
-                        node.make_barrier()
-                    elif lines[x][y].isnumeric():
-                        node.make_room(int(lines[x][y]))
-                    else:
-                        node.make_barrier()
+        self._index_rooms()
 
         # print("Map imported successfully.")
 
@@ -173,9 +332,14 @@ class Grid:
             for line in csv_file:
                 tile_map.append(line)
 
-        for y, row in enumerate(self.nodes):
-            for x, square in enumerate(row):
-                square.set_tile_id(int(tile_map[x][y]))
+        # Each line of the file is a column of the grid
+        layer = np.array([line[:self.size] for line in tile_map[:self.size]]).astype(np.int16).T
+
+        if self.tile_count.max() >= self.tiles.shape[2]:
+            self._add_tile_layer()
+        np.put_along_axis(self.tiles, self.tile_count[..., np.newaxis].astype(np.intp), layer[..., np.newaxis], axis=2)
+        self.tile_count += 1
+        self._split_layers()
 
         # print("Tile map imported successfully.")
 
@@ -193,6 +357,10 @@ class Grid:
         Returns:
             List[Barrier]: A list of barriers with which the player collides.
         """
+        # Most of the time the player touches no merged barrier, and no square needs to be checked
+        if not self.walls.collides(player_rect):
+            return []
+
         # Get the grid cell containing the player
         player_node = self.get_node((player_rect.centerx, player_rect.centery))
 
@@ -210,6 +378,19 @@ class Grid:
 
         return collided_barriers
 
+    def line_of_sight(self, start: tuple, end: tuple) -> bool:
+        """
+        Check if the straight line between two positions crosses no barrier.
+
+        Args:
+            start (tuple): The first position, in pixels.
+            end (tuple): The second position, in pixels.
+
+        Returns:
+            bool: True if no barrier lies between both positions, False otherwise.
+        """
+        return self.walls.line_of_sight(start, end)
+
     # ####################################################################### #
     #                                   POSITION                              #
     # ####################################################################### #
@@ -227,7 +408,14 @@ class Grid:
         y, x = map(int, pos)  # Convert y and x to integers
         row = y // self.gap
         col = x // self.gap
-        return self.nodes[row][col]
+        return self.get_node_from_array(row, col)
+
+    def _square(self, row: int, col: int) -> Square:
+        index = row * self.size + col
+        square = self._squares[index]
+        if square is None:
+            square = self._squares[index] = Square(self, row, col)
+        return square
 
     def get_node_from_array(self, row: int, col: int) -> Square:
         """
@@ -240,11 +428,15 @@ class Grid:
         Returns:
             Square: The node at the specified row and column.
         """
-        return self.nodes[row][col]
+        # Indexing a range keeps the bounds checking and negative indices of the former nested lists
+        return self._square(range(self.size)[row], range(self.size)[col])
+
+    def _square_from_index(self, index: int) -> Square:
+        return self._square(*divmod(index, self.size))
 
     def get_nodes_by_id(self, node_id: int) -> List[Square]:
         """
-        Get nodes with the specified ID.
+        Get the walkable nodes with the specified ID.
 
         Args:
             node_id (int): The ID of the nodes to retrieve.
@@ -252,7 +444,8 @@ class Grid:
         Returns:
             list: List of nodes with the specified ID.
         """
-        return [node for row in self.nodes for node in row if node.id == node_id]
+        cells = self._rooms.get(node_id)
+        return [self._square_from_index(index) for index in cells.cells] if cells else []
 
     def get_random_node(self) -> Square:
         """
@@ -261,12 +454,7 @@ class Grid:
         Returns:
             Square: A random non-barrier node.
         """
-        while True:
-            row = random.randint(0, self.size - 1)
-            col = random.randint(0, self.size - 1)
-            node = self.nodes[row][col]
-            if not node.is_barrier():
-                return node
+        return self._square_from_index(self._walkable.choice())
 
     def get_random_node_from_zones(self, zone_ids: List[int]) -> Optional[Square]:
         """
@@ -278,8 +466,17 @@ class Grid:
         Returns:
             Square: A random node from the specified zones, or None if no nodes found.
         """
-        possible_nodes = [node for row in self.nodes for node in row if node.id in zone_ids]
-        return random.choice(possible_nodes) if possible_nodes else None
+        zones = [self._rooms[zone_id] for zone_id in set(zone_ids) if self._rooms.get(zone_id)]
+        total = sum(len(zone) for zone in zones)
+        if total == 0:
+            return None
+
+        # Pick a cell uniformly over the union of the zones
+        position = random.randrange(total)
+        for zone in zones:
+            if position < len(zone):
+                return self._square_from_index(zone.cells[position])
+            position -= len(zone)
 
     def get_random_node_from_zone(self, zone_id: int) -> Optional[Square]:
         """
@@ -291,13 +488,164 @@ class Grid:
         Returns:
             Square: A random node from the specified zone, or None if no nodes found.
         """
-        possible_nodes = [node for row in self.nodes for node in row if node.id == zone_id]
-        return random.choice(possible_nodes) if possible_nodes else None
+        zone = self._rooms.get(zone_id)
+        return self._square_from_index(zone.choice()) if zone else None
+
+    def get_room_table(self) -> RoomTable:
+        """
+        Get the table of walks between the rooms of the grid, loading or building it the first time, and again after
+        the layout changes.
+
+        Returns:
+            RoomTable: The room table.
+        """
+        if self._room_table is None or self._room_table.layout_version != self.layout_version:
+            self._room_table = RoomTable.load(self, self.border_map_path)
+        return self._room_table
+
+    # ####################################################################### #
+    #                                 NEIGHBOURS                              #
+    # ####################################################################### #
+
+    def _squares_from_mask(self, row: int, col: int, mask: int) -> List[Square]:
+        return [self._square(row + d_row, col + d_col)
+                for bit, (d_row, d_col) in enumerate(NEIGHBOUR_OFFSETS) if mask >> bit & 1]
+
+    def get_neighbours(self, row: int, col: int) -> List[Square]:
+        """
+        Get the accessible squares around the square at the specified row and column.
+
+        Args:
+            row (int): The row index.
+            col (int): The column index.
+
+        Returns:
+            List[Square]: The neighbouring squares, cardinal ones first.
+        """
+        return self._squares_from_mask(row, col, int(self.neighbour_mask[row, col]))
+
+    def get_barriers(self, row: int, col: int) -> List[Square]:
+        """
+        Get the barriers around the square at the specified row and column.
+
+        Args:
+            row (int): The row index.
+            col (int): The column index.
+
+        Returns:
+            List[Square]: The surrounding barriers, cardinal ones first.
+        """
+        return self._squares_from_mask(row, col, int(self.barrier_mask[row, col]))
 
     # ####################################################################### #
     #                                   NODES                                 #
     # ####################################################################### #
 
+    def _add_tile_layer(self) -> None:
+        padding = np.full((self.size, self.size, 1), -1, dtype=np.int16)
+        self.tiles = np.concatenate((self.tiles, padding), axis=2)
+
+    def _split_layers(self, rows: slice = slice(None), cols: slice = slice(None)) -> None:
+        """
+        Split the tile layers of a block of squares into the layers drawn by the grid.
+
+        Args:
+            rows (slice, optional): The rows of the block. Defaults to every row.
+            cols (slice, optional): The columns of the block. Defaults to every column.
+        """
+        if self.layer_tiles.shape[3] != self.tiles.shape[2]:
+            # The number of tile layers has changed, so every square is split again
+            rows, cols = slice(None), slice(None)
+            self.layer_tiles = np.full((3,) + self.tiles.shape, -1, dtype=np.int16)
+
+        layers, counts, animated = self.tile_table.split(self.tiles[rows, cols], self.tile_count[rows, cols])
+        self.layer_tiles[:, rows, cols] = layers
+        self.layer_count[:, rows, cols] = counts
+        self.animated_layer[rows, cols] = animated
+
+    def set_tile_set(self, row: int, col: int, tile_ids: List[int]) -> None:
+        """
+        Set the tile layers of the square at the specified row and column.
+
+        Args:
+            row (int): The row index.
+            col (int): The column index.
+            tile_ids (List[int]): List of tile IDs, from the bottom layer to the top one.
+        """
+        while len(tile_ids) > self.tiles.shape[2]:
+            self._add_tile_layer()
+        self.tiles[row, col] = -1
+        self.tiles[row, col, :len(tile_ids)] = tile_ids
+        self.tile_count[row, col] = len(tile_ids)
+        self._split_layers(slice(row, row + 1), slice(col, col + 1))
+        if self.chunks is not None:
+            self.chunks.refresh(row, col)
+
+    def _index_rooms(self) -> None:
+        """
+        Rebuild the walkable cell sets from the barrier and room arrays.
+        """
+        self._walkable = CellSet()
+        self._rooms = {}
+        for index in np.flatnonzero(~self.barrier).tolist():
+            self._walkable.add(index)
+            self._rooms.setdefault(int(self.room.flat[index]), CellSet()).add(index)
+
+    def make_barrier(self, row: int, col: int) -> None:
+        """
+        Make the square at the specified row and column a barrier, and update the layout of the grid.
+
+        Args:
+            row (int): The row index.
+            col (int): The column index.
+        """
+        self._set_barrier(row, col)
+        self._update_array()
+
+    def make_room(self, row: int, col: int, room_id: int) -> None:
+        """
+        Make the square at the specified row and column part of a room, and update the layout of the grid.
+
+        Args:
+            row (int): The row index.
+            col (int): The column index.
+            room_id (int): The ID of the room.
+        """
+        self._set_room(row, col, room_id)
+        self._update_array()
+
+    def _set_barrier(self, row: int, col: int) -> None:
+        """
+        Mark the square at the specified row and column as a barrier, leaving the layout of the grid to update.
+
+        Args:
+            row (int): The row index.
+            col (int): The column index.
+        """
+        index = row * self.size + col
+        self._walkable.discard(index)
+        room = self._rooms.get(int(self.room[row, col]))
+        if room is not None:
+            room.discard(index)
+        self.barrier[row, col] = True
+
+    def _set_room(self, row: int, col: int, room_id: int) -> None:
+        """
+        Mark the square at the specified row and column as part of a room, leaving the layout of the grid to update.
+
+        Args:
+            row (int): The row index.
+            col (int): The column index.
+            room_id (int): The ID of the room.
+        """
+        self._set_barrier(row, col)
+        self.barrier[row, col] = False
+        self.room[row, col] = room_id
+
+        index = row * self.size + col
+        self._walkable.add(index)
+        self._rooms.setdefault(int(room_id), CellSet()).add(index)
+
     def set_spawn_square(self, x: int, y: int) -> None:
         """
         Set the spawn square at the specified coordinates.
@@ -311,7 +659,7 @@ class Grid:
         """
         if x < 0 or y < 0 or x >= self.size or y >= self.size:
             raise ValueError("Square out of bounds")
-        self.spawn = self.nodes[x][y]
+        self.spawn = self._square(x, y)
 
     def set_key_square(self, x: int, y: int) -> bool:
         """
@@ -324,13 +672,10 @@ class Grid:
         Returns:
             bool: True if the operation was successful, False otherwise.
         """
-        for nodes in self.nodes:
-            for node in nodes:
-                if node.is_key:
-                    node.make_key()
+        self.keys[:] = False
         if x < 0 or y < 0 or x >= self.size or y >= self.size:
             return False
-        self.nodes[x][y].make_key()
+        self.keys[x, y] = True
         return True
 
     def set_exit_square(self, x: int, y: int) -> bool:
@@ -346,7 +691,7 @@ class Grid:
         """
         if x < 0 or y < 0 or x >= self.size or y >= self.size:
             return False
-        self.nodes[x][y].make_exit()
+        self.exits[x, y] = True
         return True
 
     def is_key_square(self, x: int, y: int) -> bool:
@@ -361,7 +706,7 @@ class Grid:
             bool: True if the square contains a key, False otherwise.
         """
         node = self.get_node((x, y))
-        return node.is_key
+        return bool(self.keys[node.row, node.col])
 
     def is_exit_square(self, x: int, y: int) -> bool:
         """
@@ -375,4 +720,4 @@ class Grid:
             bool: True if the square is an exit square, False otherwise.
         """
         node = self.get_node((x, y))
-        return node.is_exit
+        return bool(self.exits[node.row, node.col])
@@ -2,6 +2,7 @@ from typing import Tuple
 
 import pygame
 
+from game.map.tiles import TileTable
 from game.sprites.spritesheet import SpriteSheet
 from utils.constants import *
 
@@ -13,9 +14,15 @@ from utils.constants import *
 
 class Square:
     """
-    A class representing a square grid cell in the pathfinding visualization grid.
+    A lightweight view over a single cell of a Grid.
+
+    The cell state (barrier flag, room id, weight, tile layers, key/exit flags and animation counters) lives in the
+    NumPy arrays owned by the grid. A Square only stores its indices and position, and it is allocated by the grid the
+    first time the cell is requested. Its rectangle, neighbours and barriers are computed on first use and kept until
+    the layout of the grid changes.
 
     Attributes:
+        grid (Grid): The grid that owns the cell data.
         row (int): The row index of the square.
         col (int): The column index of the square.
         x (float): The x-coordinate of the center of the square.
@@ -23,76 +30,122 @@ class Square:
         size (int): The size of the square.
         total_rows (int): The total number of rows in the grid.
         total_cols (int): The total number of columns in the grid.
-        neighbors (list): A list of neighboring squares.
-        barriers (list): A list of surrounding barriers.
-        id (int): The identification number of the square.
-        barrier (bool): A flag indicating whether the square is a barrier.
         color (tuple): The color of the square.
-        weight (int): The weight of the square used in pathfinding algorithms.
-        hover (bool): A flag indicating whether the square is being hovered over.
-        rect (pygame.Rect): The rectangle representing the square.
     """
 
-    def __init__(self, row, col, size, total_rows, total_cols, weight):
+    __slots__ = ('grid', 'row', 'col', 'x', 'y', '_rect', '_neighbors', '_barriers', '_layout')
+
+    color = GRID_BACKGROUND
+
+    # Animation attributes
+    _delay_frame = 2
+
+    # Key animation attributes
+    _key_limit = 1.5
+
+    def __init__(self, grid, row, col):
         """
-        Initializes a Square object with the given parameters.
+        Initializes a Square view over the given cell of the grid.
 
         Args:
+            grid (Grid): The grid that owns the cell data.
             row (int): The row index of the square.
             col (int): The column index of the square.
-            size (int): The size of the square.
-            total_rows (int): The total number of rows in the grid.
-            total_cols (int): The total number of columns in the grid.
-            weight (int): The weight of the square used in pathfinding algorithms.
 
         Returns:
             None
         """
-        super().__init__()
-
         # Grid properties
+        self.grid = grid
         self.row = row
         self.col = col
-        self.x = (row * size) + size * 0.5
-        self.y = (col * size) + size * 0.5
-        self.size = size
-        self.total_rows = total_rows
-        self.total_cols = total_cols
-
-        # Neighbors and barriers
-        self.neighbors = []
-        self.barriers = []
-
-        # Square identification and characteristics
-        self.id = -1
-        self.tile_id = []
-        self.barrier = False
-        self.color = GRID_BACKGROUND
-        self.weight = weight
-        self.hover = False
-
-        # Image and rectangle for rendering
-        self.image = pygame.Surface((self.size, self.size))
-        self.image.fill(WHITE)
-        self.rect = self.image.get_rect()
-        self.rect.center = (self.x, self.y)
-        self.rect = pygame.Rect((row * size), (col * size), size + 1, size + 1)
-
-        # Additional properties
-        self.is_key = False
-        self.is_exit = False
-
-        # Animation attributes
-        self._current_frame = 0
-        self._delay_frame = 2
-        self._pass_frame = self._delay_frame
-        self._jump_frame = 1
-        self._state = 0
-
-        # Key animation attributes
-        self._key_offset = 0
-        self._key_speed = 0.25
-        self._key_limit = 1.5
+        self.x = (row * grid.gap) + grid.gap * 0.5
+        self.y = (col * grid.gap) + grid.gap * 0.5
+
+        # Lazily computed attributes
+        self._rect = None
+        self._neighbors = None
+        self._barriers = None
+        self._layout = -1
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Square) and self.grid is other.grid and self.row == other.row and self.col == other.col
+
+    def __hash__(self) -> int:
+        return hash((self.row, self.col))
+
+    # ####################################################################### #
+    #                                PROPERTIES                               #
+    # ####################################################################### #
+
+    @property
+    def size(self) -> int:
+        return self.grid.gap
+
+    @property
+    def total_rows(self) -> int:
+        return self.grid.size
+
+    @property
+    def total_cols(self) -> int:
+        return self.grid.size
+
+    @property
+    def id(self) -> int:
+        return int(self.grid.room[self.row, self.col])
+
+    @property
+    def tile_id(self) -> list:
+        return self.grid.tiles[self.row, self.col, :self.grid.tile_count[self.row, self.col]].tolist()
+
+    @property
+    def barrier(self) -> bool:
+        return bool(self.grid.barrier[self.row, self.col])
+
+    @property
+    def weight(self) -> int:
+        return int(self.grid.weight[self.row, self.col])
+
+    @property
+    def is_key(self) -> bool:
+        return bool(self.grid.keys[self.row, self.col])
+
+    @property
+    def is_exit(self) -> bool:
+        return bool(self.grid.exits[self.row, self.col])
+
+    @property
+    def rect(self) -> pygame.Rect:
+        if self._rect is None:
+            size = self.grid.gap
+            self._rect = pygame.Rect((self.row * size), (self.col * size), size + 1, size + 1)
+        return self._rect
+
+    @property
+    def neighbors(self) -> list:
+        self._check_layout()
+        if self._neighbors is None:
+            self._neighbors = self.grid.get_neighbours(self.row, self.col)
+        return self._neighbors
+
+    @property
+    def barriers(self) -> list:
+        self._check_layout()
+        if self._barriers is None:
+            self._barriers = self.grid.get_barriers(self.row, self.col)
+        return self._barriers
+
+    def _check_layout(self) -> None:
+        """
+        Drop the cached neighbours and barriers if the grid has been updated since they were computed.
+
+        Returns:
+            None
+        """
+        if self._layout != self.grid.layout_version:
+            self._layout = self.grid.layout_version
+            self._neighbors = None
+            self._barriers = None
 
     # ####################################################################### #
     #                                VARIABLES                                #
@@ -108,7 +161,7 @@ class Square:
         Returns:
             None
         """
-        self.id = int(node_id)
+        self.grid.room[self.row, self.col] = int(node_id)
 
     def get_id(self) -> int:
         """
@@ -129,7 +182,7 @@ class Square:
         Returns:
             None
         """
-        self.tile_id.append(int(tile_id))
+        self.set_tile_set(self.tile_id + [int(tile_id)])
 
     # ####################################################################### #
     #                                  DRAW                                   #
@@ -183,23 +236,27 @@ class Square:
         Returns:
             int: The updated ID of the animated tile.
         """
-        self._current_frame += 1
-        if self._current_frame >= 3:
-            self._current_frame = 0
+        current_frame = int(self.grid.current_frame[self.row, self.col]) + 1
+        if current_frame >= 3:
+            current_frame = 0
 
-        if self._pass_frame == 0:
-            self._current_frame += 1
-            self._pass_frame = self._delay_frame
+        pass_frame = int(self.grid.pass_frame[self.row, self.col])
+        if pass_frame == 0:
+            current_frame += 1
+            pass_frame = self._delay_frame
         else:
-            self._pass_frame -= 1
+            pass_frame -= 1
+
+        self.grid.current_frame[self.row, self.col] = current_frame
+        self.grid.pass_frame[self.row, self.col] = pass_frame
 
-        if tile_id in TILE_SCREEN:
+        if self.grid.tile_table.is_screen(tile_id):
             distance = 2
         else:
             distance = 1
 
-        jump = distance * self._current_frame
-        if self._current_frame > 0:
+        jump = distance * current_frame
+        if current_frame > 0:
             jump += 1
 
         return tile_id + jump
@@ -243,31 +300,33 @@ class Square:
                 top_left_y + self.size * 2 < 0 or top_left_y > win_height:
             return
 
+        # The layers are split when the tiles are loaded, so no tile is classified here
         if only_floor:
-            tiles_to_draw = [sprite_id for sprite_id in self.tile_id if sprite_id in GROUND_TILES]
+            layer = TileTable.FLOOR_LAYER
         elif only_float:
-            tiles_to_draw = [sprite_id for sprite_id in self.tile_id if sprite_id in FLOATING_TILES and sprite_id >= 0]
+            layer = TileTable.FLOATING_LAYER
         else:
-            animated_tile_found = False
-            tiles_to_draw = []
-            for sprite_id in self.tile_id:
-                if sprite_id not in GROUND_TILES and sprite_id >= 0 and sprite_id not in FLOATING_TILES:
-                    if sprite_id in ANIMATED_TILES and not animated_tile_found:
-                        tiles_to_draw.append(self._animate(sprite_id))
-                        animated_tile_found = True
-                    else:
-                        tiles_to_draw.append(sprite_id)
+            layer = TileTable.MIDDLE_LAYER
+        tiles_to_draw = self.grid.layer_tiles[layer, self.row, self.col, :self.grid.layer_count[layer, self.row, self.col]].tolist()
+
+        animated_layer = int(self.grid.animated_layer[self.row, self.col])
+        if layer == TileTable.MIDDLE_LAYER and animated_layer >= 0:
+            tiles_to_draw[animated_layer] = self._animate(tiles_to_draw[animated_layer])
 
         if tiles_to_draw:
             for sprite_id in tiles_to_draw:
                 self._draw_sprite(win, sprite_id, sprite_sheet, offset)
 
         if key_sheet is not None and self.is_key and not only_float:
-            temp = offset + pygame.math.Vector2(0, self._key_offset)
-            self._key_offset += self._key_speed
-            if abs(self._key_offset) >= self._key_limit:
-                self._key_speed *= -1
-                self._key_offset += self._key_speed
+            key_offset = float(self.grid.key_offset[self.row, self.col])
+            key_speed = float(self.grid.key_speed[self.row, self.col])
+            temp = offset + pygame.math.Vector2(0, key_offset)
+            key_offset += key_speed
+            if abs(key_offset) >= self._key_limit:
+                key_speed *= -1
+                key_offset += key_speed
+            self.grid.key_offset[self.row, self.col] = key_offset
+            self.grid.key_speed[self.row, self.col] = key_speed
             self._draw_sprite(win, 79, key_sheet, temp)
 
     # ####################################################################### #
@@ -320,7 +379,7 @@ class Square:
         Returns:
             None
         """
-        self.tile_id = tile_id_list
+        self.grid.set_tile_set(self.row, self.col, tile_id_list)
 
     def get_weight(self) -> int:
         """
@@ -356,8 +415,7 @@ class Square:
         Returns:
             None
         """
-        self.barrier = False
-        self.color = GRID_BACKGROUND
+        self.grid.make_room(self.row, self.col, self.id)
 
     def make_barrier(self) -> None:
         """
@@ -366,7 +424,7 @@ class Square:
         Returns:
             None
         """
-        self.barrier = True
+        self.grid.make_barrier(self.row, self.col)
 
     def make_key(self) -> None:
         """
@@ -375,7 +433,7 @@ class Square:
         Returns:
             None
         """
-        self.is_key = not self.is_key
+        self.grid.keys[self.row, self.col] = not self.is_key
 
     def make_exit(self) -> None:
         """
@@ -384,7 +442,7 @@ class Square:
         Returns:
             None
         """
-        self.is_exit = True
+        self.grid.exits[self.row, self.col] = True
 
     def make_room(self, room_id) -> None:
         """
@@ -396,126 +454,7 @@ class Square:
         Returns:
             None
         """
-        self.barrier = False
-        self.set_id(room_id)
-
-    # ####################################################################### #
-    #                                NEIGHBOURS                               #
-    # ####################################################################### #
-
-    def surrounding_barrier(self, grid) -> None:
-        """
-        Update the weights of neighboring squares if the current square is a barrier.
-
-        Args:
-            grid (Grid): The grid containing the squares.
-
-        Returns:
-            None
-        """
-        bottom = self.row == self.total_rows - 1
-        top = self.row == 0
-        rightmost = self.col == self.total_cols - 1
-        leftmost = self.col == 0
-
-        if self.is_barrier():
-            if not bottom:
-                grid.nodes[self.row + 1][self.col].weight += WEIGHT
-            if not rightmost:
-                grid.nodes[self.row][self.col + 1].weight += WEIGHT
-            if not top:
-                grid.nodes[self.row - 1][self.col].weight += WEIGHT
-            if not leftmost:
-                grid.nodes[self.row][self.col - 1].weight += WEIGHT
-
-    def add_neighbour(self, node, force_barrier: bool = False) -> None:
-        """
-        Add a node as a neighbor if it's not a barrier.
-
-        Args:
-            node (Square): The node to be added as a neighbor.
-            force_barrier (Bool): Whether the node must be always a barrier.
-
-        Returns:
-            None
-        """
-        if node.is_barrier() or force_barrier:
-            self.barriers.append(node)
-        else:
-            self.neighbors.append(node)
-
-    def update_neighbors(self, grid) -> None:
-        """
-        Update the neighboring squares of the square based on its position.
-
-        Args:
-            grid (Grid): The grid containing the squares.
-
-        Returns:
-            None
-        """
-        self.neighbors = []
-        self.barriers = []
-
-        bottom = self.row == self.total_rows - 1
-        top = self.row == 0
-        rightmost = self.col == self.total_cols - 1
-        leftmost = self.col == 0
-
-        down_node = up_node = right_node = left_node = None
-        left_down_node = right_down_node = left_up_node = right_up_node = None
-
-        # Assign accessible cardinal nodes
-        if not bottom:
-            down_node = grid.nodes[self.row + 1][self.col]
-        if not top:
-            up_node = grid.nodes[self.row - 1][self.col]
-        if not rightmost:
-            right_node = grid.nodes[self.row][self.col + 1]
-        if not leftmost:
-            left_node = grid.nodes[self.row][self.col - 1]
-
-        # Assign accessible diagonal nodes
-        if not bottom and not leftmost:
-            left_down_node = grid.nodes[self.row + 1][self.col - 1]
-        if not bottom and not rightmost:
-            right_down_node = grid.nodes[self.row + 1][self.col + 1]
-        if not top and not leftmost:
-            left_up_node = grid.nodes[self.row - 1][self.col - 1]
-        if not top and not rightmost:
-            right_up_node = grid.nodes[self.row - 1][self.col + 1]
-
-        # Cardinal checks & additions
-        if down_node is not None:
-            self.add_neighbour(down_node)
-        if up_node is not None:
-            self.add_neighbour(up_node)
-        if right_node is not None:
-            self.add_neighbour(right_node)
-        if left_node is not None:
-            self.add_neighbour(left_node)
-
-        # Diagonal checks & additions
-        if left_down_node is not None and (
-                not left_node.is_barrier() and not down_node.is_barrier()):
-            self.add_neighbour(left_down_node)
-        if left_down_node is not None and left_down_node.is_barrier():
-            self.add_neighbour(left_down_node, force_barrier=True)
-        if left_up_node is not None and (
-                not left_node.is_barrier() and not up_node.is_barrier()):
-            self.add_neighbour(left_up_node)
-        if left_up_node is not None and left_up_node.is_barrier():
-            self.add_neighbour(left_up_node, force_barrier=True)
-        if right_down_node is not None and (
-                not right_node.is_barrier() and not down_node.is_barrier()):
-            self.add_neighbour(right_down_node)
-        if right_down_node is not None and right_down_node.is_barrier():
-            self.add_neighbour(right_down_node, force_barrier=True)
-        if right_up_node is not None and (
-                not right_node.is_barrier() and not up_node.is_barrier()):
-            self.add_neighbour(right_up_node)
-        if right_up_node is not None and right_up_node.is_barrier():
-            self.add_neighbour(right_up_node, force_barrier=True)
+        self.grid.make_room(self.row, self.col, int(room_id))
 
     # ####################################################################### #
     #                                  EQUALS                                 #
@@ -0,0 +1,98 @@
+from typing import Tuple
+
+import numpy as np
+
+from utils.constants import ANIMATED_TILES, FLOATING_TILES, GROUND_TILES, TILE_SCREEN
+
+
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+#                                      TILE TABLE CLASS                                         #
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+
+class TileTable:
+    """
+    Classification flags of every tile of a tileset, indexed by tile ID.
+
+    The table replaces the membership tests against the tile lists of the constants module, and splits the tile layers
+    of a map into the floor, middle and floating layers drawn by the grid.
+
+    Attributes:
+        flags (np.ndarray): The flags of each tile ID, as a combination of GROUND, FLOATING, ANIMATED and SCREEN.
+    """
+
+    GROUND = 1
+    FLOATING = 2
+    ANIMATED = 4
+    SCREEN = 8
+
+    FLOOR_LAYER = 0
+    MIDDLE_LAYER = 1
+    FLOATING_LAYER = 2
+
+    def __init__(self, tile_count: int):
+        """
+        Initialize the flags of a tileset.
+
+        Args:
+            tile_count (int): The number of tiles of the tileset. The table grows to hold every classified tile.
+        """
+        classified = GROUND_TILES + FLOATING_TILES + ANIMATED_TILES + TILE_SCREEN
+        self.flags = np.zeros(max(tile_count, max(classified) + 1), dtype=np.uint8)
+        self.flags[GROUND_TILES] |= self.GROUND
+        self.flags[FLOATING_TILES] |= self.FLOATING
+        self.flags[ANIMATED_TILES] |= self.ANIMATED
+        self.flags[TILE_SCREEN] |= self.SCREEN
+
+    def get_flags(self, tile_ids: np.ndarray) -> np.ndarray:
+        """
+        Get the flags of an array of tile IDs. Negative and unknown IDs have no flags.
+
+        Args:
+            tile_ids (np.ndarray): The tile IDs.
+
+        Returns:
+            np.ndarray: The flags of each tile ID.
+        """
+        known = (tile_ids >= 0) & (tile_ids < len(self.flags))
+        return np.where(known, self.flags[np.where(known, tile_ids, 0)], 0).astype(np.uint8)
+
+    def is_screen(self, tile_id: int) -> bool:
+        return 0 <= tile_id < len(self.flags) and bool(self.flags[tile_id] & self.SCREEN)
+
+    def split(self, tiles: np.ndarray, tile_count: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Split the tile layers of a block of squares into the layers drawn by the grid, keeping their order.
+
+        A tile may belong to both the floor and the floating layers. The middle layer holds the remaining non-empty
+        tiles, and the first animated tile of the middle layer is the one that gets animated.
+
+        Args:
+            tiles (np.ndarray): The tile IDs of each square, with shape (rows, cols, layers).
+            tile_count (np.ndarray): The number of tile layers of each square, with shape (rows, cols).
+
+        Returns:
+            tuple: The tile IDs of each layer with shape (3, rows, cols, layers), padded with -1, the number of tiles of
+            each layer with shape (3, rows, cols), and the position of the animated tile in the middle layer of each
+            square, or -1 when there is none.
+        """
+        depth = tiles.shape[2]
+        valid = np.arange(depth) < tile_count[..., np.newaxis]
+        flags = self.get_flags(tiles)
+
+        ground = valid & (flags & self.GROUND > 0)
+        floating = valid & (tiles >= 0) & (flags & self.FLOATING > 0)
+        middle = valid & (tiles >= 0) & ~ground & ~floating
+
+        layers = np.full((3,) + tiles.shape, -1, dtype=tiles.dtype)
+        counts = np.zeros((3,) + tiles.shape[:2], dtype=np.uint8)
+        for layer, mask in ((self.FLOOR_LAYER, ground), (self.MIDDLE_LAYER, middle), (self.FLOATING_LAYER, floating)):
+            # A stable sort moves the selected tiles to the front without changing their order
+            order = np.argsort(~mask, axis=2, kind='stable')
+            counts[layer] = mask.sum(axis=2)
+            selected = np.arange(depth) < counts[layer][..., np.newaxis]
+            layers[layer] = np.where(selected, np.take_along_axis(tiles, order, axis=2), -1)
+
+        animated = (self.get_flags(layers[self.MIDDLE_LAYER]) & self.ANIMATED > 0) & (layers[self.MIDDLE_LAYER] >= 0)
+        animated_layer = np.where(animated.any(axis=2), animated.argmax(axis=2), -1).astype(np.int8)
+
+        return layers, counts, animated_layer
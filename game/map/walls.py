@@ -0,0 +1,243 @@
+from typing import List, Sequence, Tuple
+
+import numpy as np
+import pygame
+
+from utils.constants import WALL_BUCKET_SIZE
+
+
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+#                                       WALL MERGING                                            #
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+
+def merge_rects(barrier: np.ndarray) -> np.ndarray:
+    """
+    Cover the barriers of a grid with maximal rectangles, merged greedily in scan order.
+
+    Each barrier not covered yet starts a rectangle, which is widened along its row as far as possible and then grown
+    along the following rows while the whole span is made of barriers not covered yet.
+
+    Args:
+        barrier (np.ndarray): The barrier array of the grid, indexed by row and column.
+
+    Returns:
+        np.ndarray: The rectangles, one per row as (first row, first col, last row + 1, last col + 1).
+    """
+    rows, cols = barrier.shape
+    free = barrier.copy()
+    rects = []
+    for row, col in np.argwhere(barrier).tolist():
+        if not free[row, col]:
+            continue
+
+        end_col = col + 1
+        while end_col < cols and free[row, end_col]:
+            end_col += 1
+        end_row = row + 1
+        while end_row < rows and free[end_row, col:end_col].all():
+            end_row += 1
+
+        free[row:end_row, col:end_col] = False
+        rects.append((row, col, end_row, end_col))
+    return np.array(rects, dtype=np.int32).reshape(-1, 4)
+
+
+def _runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Runs of True along the second axis, as (line, first, last + 1)
+    padded = np.pad(mask, ((0, 0), (1, 1)), constant_values=False).astype(np.int8)
+    lines, starts = np.nonzero(np.diff(padded, axis=1) == 1)
+    _, ends = np.nonzero(np.diff(padded, axis=1) == -1)
+    return lines, starts, ends
+
+
+def wall_segments(barrier: np.ndarray, gap: int) -> np.ndarray:
+    """
+    Merge the edges between barrier and walkable squares into maximal horizontal and vertical wall segments.
+
+    Args:
+        barrier (np.ndarray): The barrier array of the grid, indexed by row and column.
+        gap (int): The size of a square, in pixels.
+
+    Returns:
+        np.ndarray: The segments, one per row as (start x, start y, end x, end y), in world coordinates.
+    """
+    # Walls along the columns, at the horizontal position between two rows
+    lines, starts, ends = _runs(barrier[1:] != barrier[:-1])
+    vertical = np.column_stack([lines + 1, starts, lines + 1, ends])
+
+    # Walls along the rows, at the vertical position between two columns
+    lines, starts, ends = _runs((barrier[:, 1:] != barrier[:, :-1]).T)
+    horizontal = np.column_stack([starts, lines + 1, ends, lines + 1])
+
+    return np.concatenate([vertical, horizontal]).astype(float) * gap
+
+
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+#                                      WALL INDEX CLASS                                         #
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+
+class WallIndex:
+    """
+    Merged barriers of a grid, stored in a uniform bucket index.
+
+    The barrier squares are merged into maximal rectangles, and the edges between barriers and walkable squares into
+    maximal wall segments. The map is split into square buckets, each one holding the rectangles and segments that
+    overlap it, so a query only tests the few merged shapes of the buckets it covers.
+
+    All the positions are world coordinates, the horizontal one following the rows of the grid.
+
+    Attributes:
+        rects (np.ndarray): The merged rectangles, as (left, top, right, bottom).
+        segments (np.ndarray): The wall segments, as (start x, start y, end x, end y).
+        bucket_span (int): The side of a bucket, in pixels.
+    """
+
+    def __init__(self, barrier: np.ndarray, gap: int, bucket_size: int = WALL_BUCKET_SIZE):
+        """
+        Merge the barriers of a grid and index them.
+
+        Args:
+            barrier (np.ndarray): The barrier array of the grid, indexed by row and column.
+            gap (int): The size of a square, in pixels.
+            bucket_size (int, optional): The number of squares per side of a bucket. Defaults to WALL_BUCKET_SIZE.
+        """
+        self.bucket_span = bucket_size * gap
+        self._bucket_count = -(-max(barrier.shape) // bucket_size)
+
+        self.rects = merge_rects(barrier).astype(float) * gap
+        self.segments = wall_segments(barrier, gap)
+
+        # Collisions are tested against rectangles one pixel wider, like the rectangles of the squares
+        self._rects = [pygame.Rect(left, top, right - left + 1, bottom - top + 1)
+                       for left, top, right, bottom in self.rects.tolist()]
+
+        segment_boxes = np.column_stack([np.minimum(self.segments[:, 0], self.segments[:, 2]),
+                                         np.minimum(self.segments[:, 1], self.segments[:, 3]),
+                                         np.maximum(self.segments[:, 0], self.segments[:, 2]),
+                                         np.maximum(self.segments[:, 1], self.segments[:, 3])])
+        # Rectangles are stored in every bucket they reach from a square away, so the rectangles a shape smaller than
+        # a square can collide with are all in the bucket of its center
+        self._margin = gap
+        self._rect_ids = self._index(self.rects + [-gap, -gap, gap + 1, gap + 1])
+        self._rect_buckets = [[self._rects[shape] for shape in bucket.tolist()] for bucket in self._rect_ids]
+        self._segment_ids = self._index(segment_boxes)
+
+    # ####################################################################### #
+    #                                 BUCKETS                                 #
+    # ####################################################################### #
+
+    def _bucket_range(self, left: float, top: float, right: float, bottom: float) -> Tuple[range, range]:
+        last = self._bucket_count - 1
+        first_x = min(max(int(left // self.bucket_span), 0), last)
+        last_x = min(max(int(right // self.bucket_span), 0), last)
+        first_y = min(max(int(top // self.bucket_span), 0), last)
+        last_y = min(max(int(bottom // self.bucket_span), 0), last)
+        return range(first_x, last_x + 1), range(first_y, last_y + 1)
+
+    def _index(self, boxes: np.ndarray) -> List[np.ndarray]:
+        buckets = [[] for _ in range(self._bucket_count ** 2)]
+        for shape, box in enumerate(boxes.tolist()):
+            # A shape lying on the side of a bucket is stored on both sides
+            range_x, range_y = self._bucket_range(*box)
+            for bucket_x in range_x:
+                for bucket_y in range_y:
+                    buckets[bucket_x * self._bucket_count + bucket_y].append(shape)
+        return [np.array(bucket, dtype=np.intp) for bucket in buckets]
+
+    def _candidates(self, buckets: Sequence, left: float, top: float, right: float, bottom: float) -> list:
+        range_x, range_y = self._bucket_range(left, top, right, bottom)
+        return [buckets[bucket_x * self._bucket_count + bucket_y] for bucket_x in range_x for bucket_y in range_y]
+
+    def _candidate_rects(self, rect: pygame.Rect) -> List[pygame.Rect]:
+        if rect.width <= self._margin and rect.height <= self._margin:
+            last = self._bucket_count - 1
+            bucket_x = min(max(rect.centerx // self.bucket_span, 0), last)
+            bucket_y = min(max(rect.centery // self.bucket_span, 0), last)
+            return self._rect_buckets[bucket_x * self._bucket_count + bucket_y]
+        found = self._candidates(self._rect_buckets, rect.left, rect.top, rect.right, rect.bottom)
+        return found[0] if len(found) == 1 else list({id(shape): shape for bucket in found for shape in bucket}.values())
+
+    def _candidate_ids(self, buckets: Sequence[np.ndarray], left: float, top: float, right: float,
+                       bottom: float) -> np.ndarray:
+        found = self._candidates(buckets, left, top, right, bottom)
+        return found[0] if len(found) == 1 else np.unique(np.concatenate(found))
+
+    # ####################################################################### #
+    #                                 QUERIES                                 #
+    # ####################################################################### #
+
+    def get_rects(self, rect: pygame.Rect) -> List[pygame.Rect]:
+        """
+        Get the merged rectangles that collide with a rectangle.
+
+        Args:
+            rect (pygame.Rect): The rectangle, in world coordinates.
+
+        Returns:
+            List[pygame.Rect]: The merged barrier rectangles overlapping it.
+        """
+        return [shape for shape in self._candidate_rects(rect) if rect.colliderect(shape)]
+
+    def collides(self, rect: pygame.Rect) -> bool:
+        """
+        Check if a rectangle collides with any barrier.
+
+        Args:
+            rect (pygame.Rect): The rectangle, in world coordinates.
+
+        Returns:
+            bool: True if the rectangle overlaps a barrier, False otherwise.
+        """
+        return rect.collidelist(self._candidate_rects(rect)) != -1
+
+    def get_segments(self, left: float, top: float, right: float, bottom: float) -> np.ndarray:
+        """
+        Get the wall segments stored in the buckets that cover an area.
+
+        Args:
+            left (float): The left side of the area.
+            top (float): The top side of the area.
+            right (float): The right side of the area.
+            bottom (float): The bottom side of the area.
+
+        Returns:
+            np.ndarray: The segments near the area, as (start x, start y, end x, end y). Some of them may lie outside.
+        """
+        return self.segments[self._candidate_ids(self._segment_ids, left, top, right, bottom)]
+
+    def line_of_sight(self, start: tuple, end: tuple) -> bool:
+        """
+        Check if the straight line between two points crosses no barrier. Lines grazing the side or the corner of a
+        barrier are not blocked.
+
+        Args:
+            start (tuple): The first point, in world coordinates.
+            end (tuple): The second point, in world coordinates.
+
+        Returns:
+            bool: True if no barrier lies between both points, False otherwise.
+        """
+        start_x, start_y = start
+        end_x, end_y = end
+        candidates = self._candidate_ids(self._rect_ids, min(start_x, end_x), min(start_y, end_y),
+                                         max(start_x, end_x), max(start_y, end_y))
+        if len(candidates) == 0:
+            return True
+        rects = self.rects[candidates]
+
+        # Slab test of the line against every candidate rectangle at once
+        entry = np.full(len(rects), -np.inf)
+        leave = np.full(len(rects), np.inf)
+        for origin, delta, low, high in ((start_x, end_x - start_x, rects[:, 0], rects[:, 2]),
+                                         (start_y, end_y - start_y, rects[:, 1], rects[:, 3])):
+            if delta == 0:
+                outside = (origin <= low) | (origin >= high)
+                entry = np.where(outside, np.inf, entry)
+                continue
+            near = (low - origin) / delta
+            far = (high - origin) / delta
+            entry = np.maximum(entry, np.minimum(near, far))
+            leave = np.minimum(leave, np.maximum(near, far))
+
+        blocked = (entry < leave) & (leave > 0) & (entry < 1)
+        return not blocked.any()
@@ -0,0 +1,157 @@
+import heapq
+import math
+from array import array
+from typing import List
+
+from utils.constants import NEIGHBOUR_OFFSETS
+
+
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+#                                     PATH FINDER CLASS                                         #
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+
+class PathFinder:
+    """
+    A* planner over the squares of a grid, shared by every enemy of the grid.
+
+    The search follows the same rules as the former Enemy.a_star, so both return the same paths: moving out of a square
+    costs its weight, the heuristic is the distance between the centers of the squares plus the weight of the square,
+    the open set is a binary heap ordered by score and insertion order, and a square already in the open set keeps its
+    first score.
+
+    The scores, parents and open set flags live in flat buffers of one entry per square, allocated once. Each search
+    takes a new generation number and an entry is only valid if it was written by the current generation, so the buffers
+    never need to be cleared. The neighbours, weights and centers of the squares are read from flat lists refreshed when
+    the layout of the grid changes.
+
+    Attributes:
+        grid (Grid): The grid the paths are planned on.
+        searches (int): The number of searches done.
+        expansions (int): The number of squares expanded by the last search.
+    """
+
+    def __init__(self, grid):
+        """
+        Initialize the buffers of a grid.
+
+        Args:
+            grid (Grid): The grid the paths are planned on.
+        """
+        self.grid = grid
+        self.searches = 0
+        self.expansions = 0
+
+        cells = grid.size * grid.size
+        self._g_score = array('d', bytes(8 * cells))
+        self._parent = array('l', [-1]) * cells
+        self._stamp = array('l', [0]) * cells
+        self._open = array('l', [0]) * cells
+        self._generation = 0
+
+        # Centers of the squares, computed as in Square
+        self._x = [(cell // grid.size * grid.gap) + grid.gap * 0.5 for cell in range(cells)]
+        self._y = [(cell % grid.size * grid.gap) + grid.gap * 0.5 for cell in range(cells)]
+
+        # Offsets of the neighbours reported by each neighbour mask, in the order of NEIGHBOUR_OFFSETS
+        offsets = [d_row * grid.size + d_col for d_row, d_col in NEIGHBOUR_OFFSETS]
+        self._moves = [tuple(offset for bit, offset in enumerate(offsets) if mask >> bit & 1) for mask in range(256)]
+
+        self._layout_version = None
+        self._neighbour_mask = None
+        self._weight = None
+
+    def _refresh(self) -> None:
+        if self._layout_version != self.grid.layout_version:
+            self._neighbour_mask = self.grid.neighbour_mask.ravel().tolist()
+            self._weight = self.grid.weight.ravel().tolist()
+            self._layout_version = self.grid.layout_version
+
+    def _next_generation(self) -> int:
+        self._refresh()
+        self._generation += 1
+        return self._generation
+
+    def _cell(self, square) -> int:
+        return square.row * self.grid.size + square.col
+
+    def _squares(self, cells: List[int]) -> list:
+        size = self.grid.size
+        return [self.grid.get_node_from_array(cell // size, cell % size) for cell in cells]
+
+    def _reconstruct(self, cell: int) -> List[int]:
+        cells = [cell]
+        parent = self._parent
+        while parent[cell] != -1:
+            cell = parent[cell]
+            cells.append(cell)
+        return cells[::-1]
+
+    # ####################################################################### #
+    #                                  SEARCH                                 #
+    # ####################################################################### #
+
+    def find_path(self, start, end) -> list:
+        """
+        Find the path between two squares.
+
+        Args:
+            start (Square): The square the path starts from.
+            end (Square): The square the path leads to.
+
+        Returns:
+            List[Square]: The squares of the path, both ends included, or an empty list if there is no path.
+        """
+        cells = self.find_cells(self._cell(start), self._cell(end))
+        return self._squares(cells)
+
+    def find_cells(self, start: int, end: int) -> List[int]:
+        """
+        Find the path between two squares, given by their flat index row * size + col.
+
+        Args:
+            start (int): The index of the square the path starts from.
+            end (int): The index of the square the path leads to.
+
+        Returns:
+            List[int]: The indices of the squares of the path, both ends included, or an empty list if there is no path.
+        """
+        generation = self._next_generation()
+        g_score, parent, stamp, is_open = self._g_score, self._parent, self._stamp, self._open
+        moves, neighbour_mask, weight = self._moves, self._neighbour_mask, self._weight
+        center_x, center_y = self._x, self._y
+        goal_x, goal_y = center_x[end], center_y[end]
+        sqrt, push, pop = math.sqrt, heapq.heappush, heapq.heappop
+
+        g_score[start] = 0
+        parent[start] = -1
+        stamp[start] = generation
+        is_open[start] = generation
+        open_set = [(0, 0, start)]
+        count = 0
+        expansions = 0
+        self.searches += 1
+
+        while open_set:
+            current = pop(open_set)[2]
+            is_open[current] = 0
+            expansions += 1
+
+            if current == end:
+                self.expansions = expansions
+                return self._reconstruct(end)
+
+            temp_g_score = g_score[current] + weight[current]
+            for offset in moves[neighbour_mask[current]]:
+                neighbor = current + offset
+                if stamp[neighbor] != generation or temp_g_score < g_score[neighbor]:
+                    stamp[neighbor] = generation
+                    parent[neighbor] = current
+                    g_score[neighbor] = temp_g_score
+                    if is_open[neighbor] != generation:
+                        count += 1
+                        heuristic = sqrt((center_x[neighbor] - goal_x) ** 2 + (center_y[neighbor] - goal_y) ** 2)
+                        push(open_set, (temp_g_score + (heuristic + weight[neighbor]), count, neighbor))
+                        is_open[neighbor] = generation
+
+        self.expansions = expansions
+        return []
@@ -0,0 +1,174 @@
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from utils.constants import PATH_CACHE_SIZE
+
+
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+#                                      CACHED PATH CLASS                                        #
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+
+class CachedPath:
+    """
+    A path stored in the path cache.
+
+    Enemies consume their paths while walking them, so the squares and points are stored as tuples and every caller
+    gets its own list.
+
+    Attributes:
+        nodes (Tuple[Square, ...]): The squares of the path, both ends included.
+        points (Dict[int, tuple]): The interpolated points of the path, by number of points per square.
+    """
+
+    def __init__(self, nodes: list):
+        """
+        Initialize a cached path.
+
+        Args:
+            nodes (List[Square]): The squares of the path, both ends included.
+        """
+        self.nodes = tuple(nodes)
+        self.points = {}
+
+    def get_nodes(self) -> list:
+        """
+        Get a copy of the squares of the path.
+
+        Returns:
+            List[Square]: The squares of the path.
+        """
+        return list(self.nodes)
+
+    def get_points(self, segments: int) -> Optional[list]:
+        """
+        Get a copy of the interpolated points of the path.
+
+        Args:
+            segments (int): The number of points per square the path was interpolated with.
+
+        Returns:
+            Optional[list]: The points, or None if the path has not been interpolated with that number of points.
+        """
+        points = self.points.get(segments)
+        return None if points is None else list(points)
+
+    def set_points(self, segments: int, points: list) -> None:
+        """
+        Store the interpolated points of the path.
+
+        Args:
+            segments (int): The number of points per square the path was interpolated with.
+            points (list): The points.
+        """
+        self.points[segments] = tuple(points)
+
+
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+#                                      PATH CACHE CLASS                                         #
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+
+class PathCache:
+    """
+    Least recently used cache of the paths planned on a grid, shared by every enemy of the grid.
+
+    Patrols go through the same areas over and over, so the same paths are planned many times in a session. Paths are
+    stored by the flat index row * size + col of their start and end squares, together with the planner that found
+    them, and the least recently used one is dropped when the cache is full. The whole cache is dropped when the layout
+    of the grid changes.
+
+    Attributes:
+        grid (Grid): The grid the paths are planned on.
+        capacity (int): The maximum number of paths kept.
+        store_points (bool): Whether the interpolated points of the paths are kept too.
+        hits (int): The number of paths found in the cache.
+        misses (int): The number of paths not found in the cache.
+    """
+
+    def __init__(self, grid, capacity: int = PATH_CACHE_SIZE, store_points: bool = True):
+        """
+        Initialize an empty cache.
+
+        Args:
+            grid (Grid): The grid the paths are planned on.
+            capacity (int, optional): The maximum number of paths kept. Defaults to PATH_CACHE_SIZE.
+            store_points (bool, optional): Whether the interpolated points of the paths are kept too. Defaults to True.
+        """
+        self.grid = grid
+        self.capacity = capacity
+        self.store_points = store_points
+        self.hits = 0
+        self.misses = 0
+
+        self._paths: Dict[Tuple[int, int, Hashable], CachedPath] = OrderedDict()
+        self._layout_version = grid.layout_version
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def _refresh(self) -> None:
+        if self._layout_version != self.grid.layout_version:
+            self.clear()
+            self._layout_version = self.grid.layout_version
+
+    # ####################################################################### #
+    #                                  ACCESS                                 #
+    # ####################################################################### #
+
+    def get(self, start: int, end: int, planner: Hashable = None) -> Optional[CachedPath]:
+        """
+        Get a path from the cache, marking it as the most recently used one.
+
+        Args:
+            start (int): The index of the square the path starts from.
+            end (int): The index of the square the path leads to.
+            planner (Hashable, optional): The planner that found the path. Defaults to None.
+
+        Returns:
+            Optional[CachedPath]: The path, or None if it is not in the cache.
+        """
+        self._refresh()
+        key = (start, end, planner)
+        path = self._paths.get(key)
+        if path is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._paths.move_to_end(key)
+        return path
+
+    def put(self, start: int, end: int, nodes: List, planner: Hashable = None) -> CachedPath:
+        """
+        Store a path in the cache, dropping the least recently used ones if it is full.
+
+        Args:
+            start (int): The index of the square the path starts from.
+            end (int): The index of the square the path leads to.
+            nodes (List[Square]): The squares of the path, both ends included.
+            planner (Hashable, optional): The planner that found the path. Defaults to None.
+
+        Returns:
+            CachedPath: The stored path.
+        """
+        self._refresh()
+        key = (start, end, planner)
+        path = self._paths[key] = CachedPath(nodes)
+        self._paths.move_to_end(key)
+        while len(self._paths) > self.capacity:
+            self._paths.popitem(last=False)
+        return path
+
+    def clear(self) -> None:
+        """
+        Drop every path of the cache. The statistics are kept.
+        """
+        self._paths.clear()
+
+    def hit_rate(self) -> float:
+        """
+        Get the share of the requests found in the cache.
+
+        Returns:
+            float: The number of hits over the number of requests, or 0 if there has been none.
+        """
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0.0
@@ -0,0 +1,155 @@
+import math
+from typing import List
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+
+from utils.constants import NEIGHBOUR_OFFSETS
+
+
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+#                                      FLOW FIELD CLASS                                         #
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+
+class FlowField:
+    """
+    Distance from every square of a grid to a single square, the centre, together with the next square to walk to
+    from each one to get closer to it. It is shared by every enemy of the grid chasing the player.
+
+    The field is computed by a single Dijkstra outward from the centre, over the moves allowed by the neighbour masks of
+    the squares, the same graph as Square.neighbors. It is computed again only when it is asked for another centre, or
+    when the layout of the grid changes, so all the enemies chasing the player share one search per square the player
+    steps on, however many they are. Reading the next square from any square is then a lookup.
+
+    Distances are measured in pixels walked, plus the weight of every square left, like the cost of the
+    HierarchicalPlanner.
+
+    Attributes:
+        grid (Grid): The grid the field is computed on.
+        centre (int): The flat index row * size + col of the square the field leads to, or -1 if not computed yet.
+        computations (int): The number of times the field has been computed.
+    """
+
+    def __init__(self, grid):
+        """
+        Initialize the field of a grid. The field is computed the first time it is read.
+
+        Args:
+            grid (Grid): The grid the field is computed on.
+        """
+        self.grid = grid
+        self.centre = -1
+        self.computations = 0
+
+        self._layout_version = None
+        self._graph = None
+        self._distance = None
+        self._next = None
+
+    def _refresh(self) -> None:
+        if self._layout_version != self.grid.layout_version:
+            self._build()
+            self._layout_version = self.grid.layout_version
+            self.centre = -1
+
+    def _build(self) -> None:
+        size = self.grid.size
+        gap = self.grid.gap
+        weight = self.grid.weight.ravel().astype(float)
+        neighbour_mask = self.grid.neighbour_mask.ravel()
+
+        # Moves are stored backwards, from the square reached to the square left, so the search from the centre finds
+        # the cost of walking to the centre from every square
+        sources, targets, costs = [], [], []
+        for bit, (d_row, d_col) in enumerate(NEIGHBOUR_OFFSETS):
+            source = np.flatnonzero(neighbour_mask >> bit & 1)
+            step = gap * math.sqrt(2) if d_row != 0 and d_col != 0 else gap
+            sources.append(source)
+            targets.append(source + d_row * size + d_col)
+            costs.append(step + weight[source])
+        cells = size * size
+        self._graph = csr_matrix((np.concatenate(costs), (np.concatenate(targets), np.concatenate(sources))),
+                                 shape=(cells, cells))
+
+    # ####################################################################### #
+    #                                  FIELD                                  #
+    # ####################################################################### #
+
+    def centre_on(self, cell: int) -> None:
+        """
+        Compute the field toward a square, unless it already leads there.
+
+        Args:
+            cell (int): The flat index of the square the field leads to.
+        """
+        self._refresh()
+        if cell == self.centre:
+            return
+        self._distance, self._next = dijkstra(self._graph, indices=cell, return_predecessors=True)
+        self.centre = cell
+        self.computations += 1
+
+    def next_cell(self, cell: int) -> int:
+        """
+        Get the next square to walk to from a square toward the centre of the field.
+
+        Args:
+            cell (int): The flat index of the square.
+
+        Returns:
+            int: The flat index of the next square, or a negative number at the centre or if the centre cannot be
+            reached.
+        """
+        return int(self._next[cell])
+
+    def distance(self, cell: int) -> float:
+        """
+        Get the cost of walking from a square to the centre of the field.
+
+        Args:
+            cell (int): The flat index of the square.
+
+        Returns:
+            float: The cost, or infinity if the centre cannot be reached.
+        """
+        return float(self._distance[cell])
+
+    # ####################################################################### #
+    #                                  SEARCH                                 #
+    # ####################################################################### #
+
+    def find_path(self, start, end) -> list:
+        """
+        Find the path between two squares, following the field centred on the last one.
+
+        Args:
+            start (Square): The square the path starts from.
+            end (Square): The square the path leads to.
+
+        Returns:
+            List[Square]: The squares of the path, both ends included, or an empty list if there is no path.
+        """
+        size = self.grid.size
+        cells = self.find_cells(start.row * size + start.col, end.row * size + end.col)
+        return [self.grid.get_node_from_array(*divmod(cell, size)) for cell in cells]
+
+    def find_cells(self, start: int, end: int) -> List[int]:
+        """
+        Find the path between two squares, given by their flat index row * size + col, following the field centred on
+        the last one. The field is computed again only if it is centred on another square.
+
+        Args:
+            start (int): The index of the square the path starts from.
+            end (int): The index of the square the path leads to.
+
+        Returns:
+            List[int]: The indices of the squares of the path, both ends included, or an empty list if there is no path.
+        """
+        self.centre_on(end)
+        if self._distance[start] == math.inf:
+            return []
+        cells = [start]
+        while cells[-1] != end:
+            cells.append(int(self._next[cells[-1]]))
+        return cells
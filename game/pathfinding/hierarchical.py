@@ -0,0 +1,223 @@
+import heapq
+import math
+from typing import Dict, List, Tuple
+
+import numpy as np
+from scipy import ndimage
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components, dijkstra
+
+from utils.constants import NEIGHBOUR_OFFSETS
+
+Segment = Tuple[int, int]
+
+
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+#                                 HIERARCHICAL PLANNER CLASS                                    #
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+
+class HierarchicalPlanner:
+    """
+    Hierarchical planner over the rooms of a grid.
+
+    The rooms of the layout map are joined by entrances, the runs of walkable squares of a room next to another room.
+    The middle of each entrance is a portal, linked to the square next to it in the other room. The abstract graph holds
+    the portals, the links between rooms, and the distance between every pair of portals of the same room, walking
+    inside the room. A room id can cover several parts that are not connected inside the room, and each part is handled
+    as a room of its own. It is built once per layout.
+
+    A path between two rooms is planned on the abstract graph and split into segments, one per room crossed, from the
+    square the room is entered at to the portal it is left from. The segments are refined into squares by the
+    PathFinder of the grid only when they are about to be walked.
+
+    Distances are measured in pixels walked, plus the weight of every square left, like the cost of the PathFinder.
+
+    Attributes:
+        grid (Grid): The grid the paths are planned on.
+        portals (List[int]): The flat index of every portal.
+        expansions (int): The number of portals expanded by the last search.
+    """
+
+    def __init__(self, grid):
+        """
+        Initialize the planner of a grid. The abstract graph is built the first time a path is planned.
+
+        Args:
+            grid (Grid): The grid the paths are planned on.
+        """
+        self.grid = grid
+        self.portals = []
+        self.expansions = 0
+
+        self._layout_version = None
+        self._part = None
+        self._graph = None
+        self._part_portals = {}
+        self._links = {}
+        self._distances = None
+        self._portal_row = {}
+        self._edges = {}
+
+    # ####################################################################### #
+    #                               ABSTRACT GRAPH                            #
+    # ####################################################################### #
+
+    def _refresh(self) -> None:
+        if self._layout_version != self.grid.layout_version:
+            self._build()
+            self._layout_version = self.grid.layout_version
+
+    def _build(self) -> None:
+        size = self.grid.size
+        gap = self.grid.gap
+        room = self.grid.room.ravel()
+        weight = self.grid.weight.ravel().astype(float)
+        neighbour_mask = self.grid.neighbour_mask.ravel()
+
+        # Moves between squares of the same room, as allowed by the neighbour masks
+        sources, targets, costs = [], [], []
+        for bit, (d_row, d_col) in enumerate(NEIGHBOUR_OFFSETS):
+            source = np.flatnonzero(neighbour_mask >> bit & 1)
+            target = source + d_row * size + d_col
+            inside = room[source] == room[target]
+            step = gap * math.sqrt(2) if d_row != 0 and d_col != 0 else gap
+            sources.append(source[inside])
+            targets.append(target[inside])
+            costs.append(step + weight[source[inside]])
+        cells = size * size
+        self._graph = csr_matrix((np.concatenate(costs), (np.concatenate(sources), np.concatenate(targets))),
+                                 shape=(cells, cells))
+
+        # A room id can cover several parts not connected inside the room, so each part is planned as a room of its own
+        _, part = connected_components(self._graph, directed=False)
+        self._part = part
+
+        # Entrances between rooms, one portal in the middle of each run of squares of a part next to a part of another
+        # room. Each border is seen from both rooms, so the runs are only taken from the room with the lowest id
+        rooms = self.grid.room
+        parts = part.reshape(rooms.shape)
+        walkable = ~self.grid.barrier
+        links = {}
+        for d_row, d_col in NEIGHBOUR_OFFSETS[:4]:
+            other = np.full_like(rooms, -1)
+            other[max(-d_row, 0):size - max(d_row, 0), max(-d_col, 0):size - max(d_col, 0)] = \
+                rooms[max(d_row, 0):size + min(d_row, 0), max(d_col, 0):size + min(d_col, 0)]
+            other_parts = np.full_like(parts, -1)
+            other_parts[max(-d_row, 0):size - max(d_row, 0), max(-d_col, 0):size - max(d_col, 0)] = \
+                parts[max(d_row, 0):size + min(d_row, 0), max(d_col, 0):size + min(d_col, 0)]
+            border = walkable & (other >= 0) & (other > rooms)
+            for part_id, other_id in set(zip(parts[border].tolist(), other_parts[border].tolist())):
+                labels, count = ndimage.label(border & (parts == part_id) & (other_parts == other_id),
+                                              structure=np.ones((3, 3)))
+                for label in range(1, count + 1):
+                    run = np.argwhere(labels == label)
+                    row, col = run[len(run) // 2].tolist()
+                    portal = row * size + col
+                    target = portal + d_row * size + d_col
+                    # The square next to a portal is a portal too
+                    for first, second in ((portal, target), (target, portal)):
+                        if second not in links.setdefault(first, []):
+                            links[first].append(second)
+
+        self.portals = sorted(links)
+        self._links = links
+        self._part_portals = {}
+        for portal in self.portals:
+            self._part_portals.setdefault(int(part[portal]), []).append(portal)
+
+        # Distance from every portal to every square of its room, and edges to the other portals of the room
+        self._distances = dijkstra(self._graph, indices=self.portals) if self.portals else None
+        self._portal_row = {portal: index for index, portal in enumerate(self.portals)}
+        self._edges = {}
+        for portal in self.portals:
+            distances = self._distances[self._portal_row[portal]]
+            edges = [(link, gap + float(weight[portal])) for link in links[portal]]
+            edges.extend((other, float(distances[other])) for other in self._part_portals[int(part[portal])]
+                         if other != portal and np.isfinite(distances[other]))
+            self._edges[portal] = edges
+
+    # ####################################################################### #
+    #                                  SEARCH                                 #
+    # ####################################################################### #
+
+    def plan(self, start: int, end: int) -> List[Segment]:
+        """
+        Plan the rooms crossed between two squares, given by their flat index row * size + col.
+
+        Args:
+            start (int): The index of the square the path starts from.
+            end (int): The index of the square the path leads to.
+
+        Returns:
+            List[Segment]: The segments of the path, as (first square, last square) pairs inside a single room, in
+            walking order. Each segment starts next to the end of the previous one. It is a single segment when both
+            squares are in the same room, and it is empty when the end cannot be reached.
+        """
+        self._refresh()
+        self.expansions = 0
+        part = self._part
+        if part[start] == part[end]:
+            return [(start, end)]
+
+        # Distance from the start to the portals of its room, and from the portals of the end room to the end
+        from_start = dijkstra(self._graph, indices=start)
+        goal_part = int(part[end])
+        goal = -1
+
+        size, gap = self.grid.size, self.grid.gap
+        end_row, end_col = divmod(end, size)
+
+        def heuristic(cell: int) -> float:
+            # Straight distance to the end, which no walk between portals can beat
+            if cell == goal:
+                return 0
+            row, col = divmod(cell, size)
+            return math.hypot(row - end_row, col - end_col) * gap
+
+        distance: Dict[int, float] = {}
+        came_from: Dict[int, int] = {}
+        open_set = []
+        for portal in self._part_portals.get(int(part[start]), []):
+            if np.isfinite(from_start[portal]):
+                distance[portal] = float(from_start[portal])
+                came_from[portal] = start
+                heapq.heappush(open_set, (distance[portal] + heuristic(portal), distance[portal], portal))
+
+        while open_set:
+            _, cost, current = heapq.heappop(open_set)
+            if cost > distance.get(current, math.inf):
+                continue
+            if current == goal:
+                break
+            self.expansions += 1
+
+            moves = self._edges[current]
+            if part[current] == goal_part:
+                moves = moves + [(goal, float(self._distances[self._portal_row[current], end]))]
+
+            for neighbor, step in moves:
+                if cost + step < distance.get(neighbor, math.inf):
+                    distance[neighbor] = cost + step
+                    came_from[neighbor] = current
+                    heapq.heappush(open_set, (cost + step + heuristic(neighbor), cost + step, neighbor))
+
+        if goal not in came_from:
+            return []
+
+        waypoints = [end]
+        current = came_from[goal]
+        while current != start:
+            waypoints.append(current)
+            current = came_from[current]
+        waypoints.append(start)
+        waypoints.reverse()
+
+        # A new segment starts every time the path steps into another room
+        segments = []
+        first = waypoints[0]
+        for previous, current in zip(waypoints, waypoints[1:]):
+            if part[previous] != part[current]:
+                segments.append((first, previous))
+                first = current
+        segments.append((first, waypoints[-1]))
+        return segments
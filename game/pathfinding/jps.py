@@ -0,0 +1,208 @@
+import heapq
+import math
+from typing import List
+
+from game.pathfinding.astar import PathFinder
+from utils.constants import NEIGHBOUR_OFFSETS
+
+
+def _sign(value: int) -> int:
+    return (value > 0) - (value < 0)
+
+
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+#                                  JUMP POINT FINDER CLASS                                      #
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+
+class JumpPointFinder(PathFinder):
+    """
+    Jump Point Search planner over the squares of a grid.
+
+    Most of the floor of a level is made of squares of weight 0, where many paths of the same length join the same two
+    squares. Instead of expanding every square, the search jumps in straight and diagonal lines, and only stops at the
+    squares where the path may have to turn: the end square, and the squares with a forced neighbour, a side square
+    only reached by turning there. A side square is forced where the side of the previous square of the line is a wall
+    or has another weight, so the jumps also stop where the band of weighted squares along a wall begins or ends.
+
+    The moves follow the neighbour masks of the grid, so a diagonal move needs both squares it cuts through to be free,
+    like in Square.update_neighbors. With that rule a diagonal jump has no forced neighbours of its own, and stops
+    where a straight jump along either of its sides finds a jump point.
+
+    Distances are measured in pixels walked, plus the weight of every square left, like the cost of the
+    HierarchicalPlanner, and the cost of a jump adds up the weights of the squares it crosses. The pruning assumes the
+    squares around a line cost the same, so a path found next to the weighted squares may be slightly longer than the
+    shortest one. The jump points found are joined back into every square walked between them.
+
+    It is not offered as a path mode of the enemies. The PathFinder keeps the rules of the former Enemy.a_star, which
+    the pruning cannot follow, so the jumps return other paths, and in pure Python the scans take longer than the
+    squares they save. The finder is kept to measure that pruning in benchmarks/jump_point_search.py.
+
+    Attributes:
+        grid (Grid): The grid the paths are planned on.
+        searches (int): The number of searches done.
+        expansions (int): The number of jump points expanded by the last search.
+    """
+
+    def __init__(self, grid):
+        """
+        Initialize the buffers of a grid.
+
+        Args:
+            grid (Grid): The grid the paths are planned on.
+        """
+        super().__init__(grid)
+        self._bit = {offset: 1 << bit for bit, offset in enumerate(NEIGHBOUR_OFFSETS)}
+
+    # ####################################################################### #
+    #                                  JUMPS                                  #
+    # ####################################################################### #
+
+    def _directions(self, cell: int, parent: int) -> list:
+        # Directions worth searching from a jump point, given the direction it was reached from
+        neighbour_mask, weight, bit = self._neighbour_mask, self._weight, self._bit
+        mask = neighbour_mask[cell]
+        if parent == -1:
+            return [direction for direction in NEIGHBOUR_OFFSETS if mask & bit[direction]]
+
+        size = self.grid.size
+        row, col = divmod(cell, size)
+        parent_row, parent_col = divmod(parent, size)
+        d_row, d_col = _sign(row - parent_row), _sign(col - parent_col)
+        previous = cell - d_row * size - d_col
+
+        if d_row and d_col:
+            candidates = [(d_row, 0), (0, d_col), (d_row, d_col)]
+        else:
+            candidates = [(d_row, d_col)]
+            # The sides are only forced where the side of the previous square was a wall, or costs differently
+            for side_row, side_col in ((d_col, d_row), (-d_col, -d_row)):
+                side = (side_row, side_col)
+                side_step = side_row * size + side_col
+                if mask & bit[side] and (not neighbour_mask[previous] & bit[side]
+                                         or weight[previous + side_step] != weight[cell + side_step]):
+                    candidates.extend((side, (d_row + side_row, d_col + side_col)))
+        return [direction for direction in candidates if mask & bit[direction]]
+
+    def _scan(self, cell: int, d_row: int, d_col: int, end: int) -> int:
+        # Straight jump from a square, returning the first jump point found or -1
+        neighbour_mask, weight = self._neighbour_mask, self._weight
+        step = d_row * self.grid.size + d_col
+        move = self._bit[(d_row, d_col)]
+        if d_row:
+            sides = ((1, self._bit[(0, 1)]), (-1, self._bit[(0, -1)]))
+        else:
+            sides = ((self.grid.size, self._bit[(1, 0)]), (-self.grid.size, self._bit[(-1, 0)]))
+
+        if not neighbour_mask[cell] & move:
+            return -1
+        cell += step
+        while True:
+            if cell == end:
+                return cell
+            previous = cell - step
+            for side_step, side_move in sides:
+                # A side square opens where the side of the previous square was a wall, or costs differently
+                if neighbour_mask[cell] & side_move and (not neighbour_mask[previous] & side_move
+                                                         or weight[previous + side_step] != weight[cell + side_step]):
+                    return cell
+            if not neighbour_mask[cell] & move:
+                return -1
+            cell += step
+
+    def _jump(self, cell: int, d_row: int, d_col: int, end: int) -> int:
+        # Jump from a square in any direction, returning the first jump point found or -1
+        if not (d_row and d_col):
+            return self._scan(cell, d_row, d_col, end)
+
+        neighbour_mask = self._neighbour_mask
+        step = d_row * self.grid.size + d_col
+        move = self._bit[(d_row, d_col)]
+        if not neighbour_mask[cell] & move:
+            return -1
+        cell += step
+        while True:
+            if cell == end:
+                return cell
+            if self._scan(cell, d_row, 0, end) != -1 or self._scan(cell, 0, d_col, end) != -1:
+                return cell
+            if not neighbour_mask[cell] & move:
+                return -1
+            cell += step
+
+    def _join(self, jump_points: List[int]) -> List[int]:
+        # Every square walked between consecutive jump points, which always lie on a straight or diagonal line
+        size = self.grid.size
+        cells = jump_points[:1]
+        for first, last in zip(jump_points, jump_points[1:]):
+            first_row, first_col = divmod(first, size)
+            last_row, last_col = divmod(last, size)
+            step = _sign(last_row - first_row) * size + _sign(last_col - first_col)
+            while first != last:
+                first += step
+                cells.append(first)
+        return cells
+
+    # ####################################################################### #
+    #                                  SEARCH                                 #
+    # ####################################################################### #
+
+    def find_cells(self, start: int, end: int) -> List[int]:
+        """
+        Find the path between two squares, given by their flat index row * size + col.
+
+        Args:
+            start (int): The index of the square the path starts from.
+            end (int): The index of the square the path leads to.
+
+        Returns:
+            List[int]: The indices of the squares of the path, both ends included, or an empty list if there is no path.
+        """
+        generation = self._next_generation()
+        g_score, parent, stamp = self._g_score, self._parent, self._stamp
+        weight = self._weight
+        size, gap = self.grid.size, self.grid.gap
+        diagonal_gap = gap * math.sqrt(2)
+        end_row, end_col = divmod(end, size)
+        push, pop = heapq.heappush, heapq.heappop
+
+        g_score[start] = 0
+        parent[start] = -1
+        stamp[start] = generation
+        open_set = [(0, 0, 0, start)]
+        count = 0
+        expansions = 0
+        self.searches += 1
+
+        while open_set:
+            _, _, cost, current = pop(open_set)
+            if cost > g_score[current]:
+                continue
+            expansions += 1
+
+            if current == end:
+                self.expansions = expansions
+                return self._join(self._reconstruct(end))
+
+            row, col = divmod(current, size)
+            for d_row, d_col in self._directions(current, parent[current]):
+                jump_point = self._jump(current, d_row, d_col, end)
+                if jump_point == -1:
+                    continue
+
+                jump_row, jump_col = divmod(jump_point, size)
+                steps = max(abs(jump_row - row), abs(jump_col - col))
+                # Every square left along the jump adds its weight
+                temp_g_score = (cost + steps * (diagonal_gap if d_row and d_col else gap)
+                                + sum(weight[current:jump_point:d_row * size + d_col]))
+                if stamp[jump_point] != generation or temp_g_score < g_score[jump_point]:
+                    stamp[jump_point] = generation
+                    parent[jump_point] = current
+                    g_score[jump_point] = temp_g_score
+                    # Octile distance to the end, which no walk over the squares can beat
+                    dx, dy = abs(jump_row - end_row), abs(jump_col - end_col)
+                    heuristic = gap * max(dx, dy) + (diagonal_gap - gap) * min(dx, dy)
+                    count += 1
+                    push(open_set, (temp_g_score + heuristic, count, temp_g_score, jump_point))
+
+        self.expansions = expansions
+        return []
@@ -0,0 +1,249 @@
+import hashlib
+import math
+import os
+import zipfile
+from typing import Iterable, List, Optional
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+
+from utils.constants import NEIGHBOUR_OFFSETS
+
+# Version of the content of the table files, tables saved by an older version are built again
+_FORMAT = 2
+
+
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+#                                      ROOM TABLE CLASS                                         #
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+
+class RoomTable:
+    """
+    Precomputed shortest walk between every pair of rooms of a grid.
+
+    The squares of a room id are not always connected, so no single square stands for a room. A Dijkstra seeded from
+    every square of a room at once gives the distance to the nearest square of every other room, and the shortest walk
+    to it gives the portal, the square the walk leaves the first room from, and the room it steps into. Destinations
+    drawn from room ids can then be ranked, or dropped when they cannot be reached, without planning a single path.
+
+    Distances are measured in pixels walked, plus the weight of every square left, like the cost of the
+    HierarchicalPlanner.
+
+    The table is saved next to the border map of the level, together with a digest of the map, and it is built again
+    whenever the map changes.
+
+    Attributes:
+        grid (Grid): The grid the table was built for.
+        rooms (np.ndarray): The id of every room, sorted.
+        distances (np.ndarray): The distance between the nearest squares of every pair of rooms, infinite if there is
+            no walk.
+        portals (np.ndarray): The flat index row * size + col of the square every walk between two rooms leaves the
+            first one from, or -1.
+        next_rooms (np.ndarray): The room every walk between two rooms steps into after the first one, or -1.
+    """
+
+    def __init__(self, grid):
+        """
+        Initialize an empty table. Use RoomTable.load to get a table ready to read.
+
+        Args:
+            grid (Grid): The grid the table is built for.
+        """
+        self.grid = grid
+        self.layout_version = grid.layout_version
+        self.rooms = np.zeros(0, dtype=np.int32)
+        self.distances = np.zeros((0, 0))
+        self.portals = np.zeros((0, 0), dtype=np.int32)
+        self.next_rooms = np.zeros((0, 0), dtype=np.int32)
+        self._index = {}
+
+    # ####################################################################### #
+    #                                  STORAGE                                #
+    # ####################################################################### #
+
+    @staticmethod
+    def get_path(source_path: str) -> str:
+        """
+        Get the path of the table file of a border map.
+
+        Args:
+            source_path (str): The path of the border map file.
+
+        Returns:
+            str: The path of the table file, next to the border map.
+        """
+        return os.path.splitext(source_path)[0] + '_rooms.npz'
+
+    def _digest(self, source_path: Optional[str]) -> str:
+        digest = hashlib.sha1()
+        if source_path is not None and os.path.exists(source_path):
+            with open(source_path, 'rb') as file:
+                digest.update(file.read())
+        digest.update(self.grid.barrier.tobytes())
+        digest.update(self.grid.room.tobytes())
+        digest.update(self.grid.weight.tobytes())
+        digest.update(f'{self.grid.gap}:{_FORMAT}'.encode())
+        return digest.hexdigest()
+
+    @classmethod
+    def load(cls, grid, source_path: Optional[str] = None) -> 'RoomTable':
+        """
+        Load the table of a grid from disk, or build it and save it if it is missing or out of date.
+
+        Args:
+            grid (Grid): The grid of the table.
+            source_path (str, optional): The path of the border map of the grid. Without it the table is only kept
+                in memory. Defaults to None.
+
+        Returns:
+            RoomTable: The table, ready to read.
+        """
+        table = cls(grid)
+        digest = table._digest(source_path)
+        path = cls.get_path(source_path) if source_path is not None else None
+
+        if path is not None and os.path.exists(path):
+            try:
+                with np.load(path) as data:
+                    if str(data['digest']) == digest:
+                        table._set(data['rooms'], data['distances'], data['portals'], data['next_rooms'])
+                        return table
+            except (OSError, EOFError, ValueError, KeyError, zipfile.BadZipFile):
+                pass  # A truncated or corrupt table is built again and overwritten
+
+        table.build()
+        if path is not None:
+            try:
+                np.savez_compressed(path, digest=np.array(digest), rooms=table.rooms, distances=table.distances,
+                                    portals=table.portals, next_rooms=table.next_rooms)
+            except OSError:
+                pass  # The table still works from memory when the level folder is read-only
+        return table
+
+    def _set(self, rooms, distances, portals, next_rooms) -> None:
+        self.rooms = rooms
+        self.distances = distances
+        self.portals = portals
+        self.next_rooms = next_rooms
+        self._index = {room_id: index for index, room_id in enumerate(rooms.tolist())}
+
+    # ####################################################################### #
+    #                                   BUILD                                 #
+    # ####################################################################### #
+
+    def build(self) -> None:
+        """
+        Walk from every room to every other room and store the distances, portals and next rooms.
+        """
+        size = self.grid.size
+        gap = self.grid.gap
+        room = self.grid.room.ravel()
+        weight = self.grid.weight.ravel().astype(float)
+        neighbour_mask = self.grid.neighbour_mask.ravel()
+        walkable = ~self.grid.barrier.ravel()
+
+        rooms = np.unique(room[walkable & (room >= 0)]).astype(np.int32)
+        members = [np.flatnonzero(walkable & (room == room_id)) for room_id in rooms.tolist()]
+
+        sources, targets, costs = [], [], []
+        for bit, (d_row, d_col) in enumerate(NEIGHBOUR_OFFSETS):
+            source = np.flatnonzero(neighbour_mask >> bit & 1)
+            step = gap * math.sqrt(2) if d_row != 0 and d_col != 0 else gap
+            sources.append(source)
+            targets.append(source + d_row * size + d_col)
+            costs.append(step + weight[source])
+        cells = size * size
+        graph = csr_matrix((np.concatenate(costs), (np.concatenate(sources), np.concatenate(targets))),
+                           shape=(cells, cells))
+
+        count = len(rooms)
+        distances = np.zeros((count, count))
+        portals = np.full((count, count), -1, dtype=np.int32)
+        next_rooms = np.full((count, count), -1, dtype=np.int32)
+
+        room_list = room.tolist()
+        for first in range(count):
+            # A single search seeded from every square of the room gives the walk from the nearest one to each square
+            from_room, predecessors, _ = dijkstra(graph, indices=members[first], min_only=True,
+                                                  return_predecessors=True)
+            parents = predecessors.tolist()
+            for second in range(count):
+                if first == second:
+                    continue
+                nearest = int(members[second][np.argmin(from_room[members[second]])])
+                distances[first, second] = from_room[nearest]
+                if not np.isfinite(from_room[nearest]):
+                    continue
+                # The walk is followed back to the square of the room it started from, the last one before leaving it
+                cell, step = nearest, nearest
+                while parents[cell] >= 0:
+                    cell, step = parents[cell], cell
+                portals[first, second] = cell
+                next_rooms[first, second] = room_list[step]
+
+        self._set(rooms, distances, portals, next_rooms)
+
+    # ####################################################################### #
+    #                                   READ                                  #
+    # ####################################################################### #
+
+    def distance(self, first: int, second: int) -> float:
+        """
+        Get the distance walked between the nearest squares of two rooms.
+
+        Args:
+            first (int): The id of the room the walk starts from.
+            second (int): The id of the room the walk leads to.
+
+        Returns:
+            float: The distance, 0 within the same room, or infinity if there is no walk or a room is unknown.
+        """
+        if first not in self._index or second not in self._index:
+            return math.inf
+        return float(self.distances[self._index[first], self._index[second]])
+
+    def next_portal(self, first: int, second: int) -> int:
+        """
+        Get the square the shortest walk between two rooms leaves the first one from.
+
+        Args:
+            first (int): The id of the room the walk starts from.
+            second (int): The id of the room the walk leads to.
+
+        Returns:
+            int: The flat index of the square, or -1 within the same room, if there is no walk or a room is unknown.
+        """
+        if first not in self._index or second not in self._index:
+            return -1
+        return int(self.portals[self._index[first], self._index[second]])
+
+    def next_room(self, first: int, second: int) -> int:
+        """
+        Get the room the shortest walk between two rooms steps into after the first one.
+
+        Args:
+            first (int): The id of the room the walk starts from.
+            second (int): The id of the room the walk leads to.
+
+        Returns:
+            int: The id of the room, or -1 within the same room, if there is no walk or a room is unknown.
+        """
+        if first not in self._index or second not in self._index:
+            return -1
+        return int(self.next_rooms[self._index[first], self._index[second]])
+
+    def rank(self, room_id: int, candidates: Iterable[int]) -> List[int]:
+        """
+        Sort rooms by their distance from a room, dropping the ones that cannot be reached from it.
+
+        Args:
+            room_id (int): The id of the room the walks start from.
+            candidates (Iterable[int]): The ids of the rooms to sort.
+
+        Returns:
+            List[int]: The reachable candidates, nearest first.
+        """
+        distances = {candidate: self.distance(room_id, candidate) for candidate in candidates}
+        return sorted((candidate for candidate, distance in distances.items() if distance != math.inf),
+                      key=distances.get)
@@ -0,0 +1,168 @@
+import heapq
+import time
+from typing import Dict, Optional
+
+from game.pathfinding.workers import PathWorkerPool
+from utils.constants import PATH_BUDGET
+from utils.enums import PathPriority
+
+# Weight of the last request served in the average time of a request
+_SMOOTHING = 0.2
+
+
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+#                                    PATH SCHEDULER CLASS                                       #
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+
+class PathScheduler:
+    """
+    Queue of the paths requested by the enemies of a level, planned under a time budget per frame.
+
+    Enemies submit their requests instead of planning them on the spot, and keep walking their current path until the
+    request is served. Once per frame the queue is served by priority, then by arrival, until the budget is spent, so a
+    frame where every enemy replans at once is spread over the following ones. At least one request is served every
+    frame, so the queue always moves.
+
+    Another request is only started when the average time of a request still fits in the budget left. A search is
+    never split, so the first request of a frame, or one much longer than the average, still overruns the budget by
+    its own length. Such frames are counted in overruns.
+
+    An enemy has at most one request waiting. A new request replaces the waiting one, keeping its place in the queue
+    unless the new priority is higher, and is dropped if the waiting one has a higher priority.
+
+    With a worker pool, serving a request only sends its search to the workers, unless the path is cached, and the path
+    is walked once the pool delivers it.
+
+    Attributes:
+        budget (float): The milliseconds per frame spent serving requests.
+        pool (Optional[PathWorkerPool]): The worker pool the searches are sent to, or None to search them on the spot.
+        served (int): The number of requests served.
+        deferred (int): The number of requests left waiting at the end of a frame, added over every frame.
+        overruns (int): The number of frames the requests served took longer than the budget.
+    """
+
+    def __init__(self, budget: float = PATH_BUDGET, pool: Optional[PathWorkerPool] = None):
+        """
+        Initialize an empty scheduler.
+
+        Args:
+            budget (float, optional): The milliseconds per frame spent serving requests. Defaults to PATH_BUDGET.
+            pool (PathWorkerPool, optional): The worker pool the searches are sent to. Defaults to None.
+        """
+        self.budget = budget
+        self.pool = pool
+        self.served = 0
+        self.deferred = 0
+        self.overruns = 0
+
+        self._queue = []
+        self._requests: Dict[object, dict] = {}
+        self._priorities: Dict[object, int] = {}
+        self._count = 0
+        self._delivery_time = 0.0
+        self._request_time = 0.0
+
+    def __len__(self) -> int:
+        return len(self._requests)
+
+    # ####################################################################### #
+    #                                 REQUESTS                                #
+    # ####################################################################### #
+
+    def submit(self, enemy, priority: PathPriority, **request) -> None:
+        """
+        Queue a path request of an enemy, replacing the one it had waiting unless that one has a higher priority.
+
+        Args:
+            enemy (Enemy): The enemy the path is planned for.
+            priority (PathPriority): The priority of the request.
+            **request: The arguments the path is planned with, passed to Enemy.plan_path.
+        """
+        waiting = self._priorities.get(enemy, len(PathPriority))
+        if priority.value > waiting:
+            return
+        self._requests[enemy] = request
+        if priority.value < waiting:
+            self._priorities[enemy] = priority.value
+            self._count += 1
+            heapq.heappush(self._queue, (priority.value, self._count, enemy))
+
+    def is_waiting(self, enemy) -> bool:
+        """
+        Check if an enemy has a request waiting, or a search running in the worker pool.
+
+        Args:
+            enemy (Enemy): The enemy.
+
+        Returns:
+            bool: True if the enemy has a request waiting, False otherwise.
+        """
+        return enemy in self._requests or (self.pool is not None and self.pool.is_waiting(enemy))
+
+    def cancel(self, enemy) -> None:
+        """
+        Drop the request an enemy has waiting, if any.
+
+        Args:
+            enemy (Enemy): The enemy.
+        """
+        self._requests.pop(enemy, None)
+        self._priorities.pop(enemy, None)
+
+    def clear(self) -> None:
+        """
+        Drop every request waiting, and stop the worker pool.
+        """
+        self._queue.clear()
+        self._requests.clear()
+        self._priorities.clear()
+        if self.pool is not None:
+            self.pool.close()
+
+    # ####################################################################### #
+    #                                  SERVING                                #
+    # ####################################################################### #
+
+    def run(self) -> int:
+        """
+        Serve the waiting requests by priority until the budget of the frame is spent.
+
+        Returns:
+            int: The number of requests served.
+        """
+        # The time spent delivering paths at the start of the frame comes out of the same budget
+        deadline = time.perf_counter() + self.budget / 1000 - self._delivery_time
+        self._delivery_time = 0.0
+        served = 0
+        while self._queue and (served == 0 or time.perf_counter() + self._request_time < deadline):
+            priority, _, enemy = heapq.heappop(self._queue)
+            # Entries left behind by a request that was raised to a higher priority, served or cancelled
+            if self._priorities.get(enemy) != priority:
+                continue
+            request = self._requests.pop(enemy)
+            del self._priorities[enemy]
+            if enemy.alive():
+                begin = time.perf_counter()
+                enemy.plan_path(**request, pool=self.pool)
+                self._request_time += (time.perf_counter() - begin - self._request_time) * _SMOOTHING
+                served += 1
+
+        if time.perf_counter() > deadline:
+            self.overruns += 1
+        self.served += served
+        self.deferred += len(self._requests)
+        return served
+
+    def deliver(self) -> int:
+        """
+        Hand the paths found by the worker pool to their enemies, within the budget of the frame.
+
+        Returns:
+            int: The number of paths delivered.
+        """
+        if self.pool is None:
+            return 0
+        begin = time.perf_counter()
+        delivered = self.pool.deliver(self.budget)
+        self._delivery_time = time.perf_counter() - begin
+        return delivered
@@ -0,0 +1,225 @@
+import threading
+import time
+import traceback
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from game.pathfinding.astar import PathFinder
+from utils.enums import PathMode, PathWorkers
+
+# Path finders of the current worker, created once per worker by _initialize
+_local = threading.local()
+
+
+def _initialize(grid) -> None:
+    _local.finders = {PathMode.ASTAR: PathFinder(grid)}
+
+
+def _find(mode: PathMode, start: int, end: int) -> List[int]:
+    return _local.finders[mode].find_cells(start, end)
+
+
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+#                                     SHARED LAYOUT CLASS                                       #
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+
+class SharedLayout:
+    """
+    Copy of the walkability arrays of a grid in shared memory, holding everything the path finders read from a grid.
+
+    The layout is created by the main process, and attached by the worker processes when it is unpickled, so the arrays
+    are never copied between processes.
+
+    Attributes:
+        size (int): The number of squares per side of the grid.
+        gap (int): The size of a square, in pixels.
+        layout_version (int): The layout version of the grid the arrays were copied from.
+        neighbour_mask (np.ndarray): The neighbour masks of the squares.
+        weight (np.ndarray): The weights of the squares.
+    """
+
+    _ARRAYS = ('neighbour_mask', 'weight')
+
+    def __init__(self, grid):
+        """
+        Copy the arrays of a grid into new shared memory blocks.
+
+        Args:
+            grid (Grid): The grid whose arrays are copied.
+        """
+        self.size = grid.size
+        self.gap = grid.gap
+        self.layout_version = grid.layout_version
+        self._owner = True
+        self._blocks = {}
+        for name in self._ARRAYS:
+            array = getattr(grid, name)
+            block = shared_memory.SharedMemory(create=True, size=array.nbytes)
+            self._blocks[name] = (block, array.shape, array.dtype.str)
+            setattr(self, name, np.ndarray(array.shape, array.dtype, buffer=block.buf))
+            getattr(self, name)[:] = array
+
+    def __getstate__(self) -> dict:
+        blocks = {name: (block.name, shape, dtype) for name, (block, shape, dtype) in self._blocks.items()}
+        return {'size': self.size, 'gap': self.gap, 'layout_version': self.layout_version, 'blocks': blocks}
+
+    def __setstate__(self, state: dict) -> None:
+        self.size = state['size']
+        self.gap = state['gap']
+        self.layout_version = state['layout_version']
+        self._owner = False
+        self._blocks = {}
+        for name, (block_name, shape, dtype) in state['blocks'].items():
+            block = shared_memory.SharedMemory(name=block_name)
+            self._blocks[name] = (block, shape, dtype)
+            setattr(self, name, np.ndarray(shape, dtype, buffer=block.buf))
+
+    def close(self) -> None:
+        """
+        Detach the shared memory blocks, and free them if this is the layout that created them.
+        """
+        for name in self._ARRAYS:
+            setattr(self, name, None)
+        for block, _, _ in self._blocks.values():
+            block.close()
+            if self._owner:
+                block.unlink()
+        self._blocks = {}
+
+
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+#                                   PATH WORKER POOL CLASS                                      #
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+
+class PathWorkerPool:
+    """
+    Pool of workers searching the paths of the enemies of a grid off the main thread.
+
+    Searches only read the walkability of the grid, so they can run anywhere. Each worker owns its own path finders:
+    worker threads read the arrays of the grid itself, and worker processes read a copy of them in shared memory, made
+    again when the layout of the grid changes. The A* and jump point searches are pure Python and hold the GIL, so only
+    processes run them in parallel with the game; threads would need a search that releases it.
+
+    Found paths are delivered back to their enemies on the main thread, the next time deliver is called, since turning
+    them into points to walk touches the enemies. An enemy has at most one search running, and the result of a search
+    replaced by a newer one is dropped.
+
+    Attributes:
+        grid (Grid): The grid the paths are planned on.
+        kind (PathWorkers): Whether the workers are threads or processes.
+        workers (int): The number of workers.
+        submitted (int): The number of searches submitted.
+        delivered (int): The number of paths delivered.
+        failed (int): The number of searches that raised, whose requests were dropped.
+    """
+
+    def __init__(self, grid, workers: int, kind: PathWorkers = PathWorkers.PROCESS):
+        """
+        Initialize the pool of a grid. The workers are started with the first search.
+
+        Args:
+            grid (Grid): The grid the paths are planned on.
+            workers (int): The number of workers.
+            kind (PathWorkers, optional): Whether the workers are threads or processes. Defaults to
+                PathWorkers.PROCESS.
+        """
+        self.grid = grid
+        self.kind = kind
+        self.workers = workers
+        self.submitted = 0
+        self.delivered = 0
+        self.failed = 0
+
+        self._executor = None
+        self._layout = None
+        self._layout_version = None
+        self._searches: Dict[object, Tuple[Future, int, int, PathMode, dict]] = {}
+
+    def _start(self) -> None:
+        if self._executor is not None and self._layout_version == self.grid.layout_version:
+            return
+        # Searches on the former layout are dropped, their enemies plan again once their current path is walked
+        self.close()
+        self._layout_version = self.grid.layout_version
+        if self.kind == PathWorkers.PROCESS:
+            self._layout = SharedLayout(self.grid)
+            self._executor = ProcessPoolExecutor(self.workers, initializer=_initialize, initargs=(self._layout,))
+        else:
+            self._executor = ThreadPoolExecutor(self.workers, initializer=_initialize, initargs=(self.grid,))
+
+    # ####################################################################### #
+    #                                 SEARCHES                                #
+    # ####################################################################### #
+
+    def submit(self, enemy, start: int, end: int, mode: PathMode, **request) -> None:
+        """
+        Send the search of a path to the workers, replacing the one the enemy had running.
+
+        Args:
+            enemy (Enemy): The enemy the path is planned for.
+            start (int): The index of the square the path starts from.
+            end (int): The index of the square the path leads to.
+            mode (PathMode): The planner used to find the path, PathMode.ASTAR.
+            **request: The arguments the path is delivered with, passed to Enemy.receive_path.
+        """
+        self._start()
+        future = self._executor.submit(_find, mode, start, end)
+        self._searches[enemy] = (future, start, end, mode, request)
+        self.submitted += 1
+
+    def is_waiting(self, enemy) -> bool:
+        """
+        Check if an enemy has a search running or waiting to be delivered.
+
+        Args:
+            enemy (Enemy): The enemy.
+
+        Returns:
+            bool: True if the enemy has a search pending, False otherwise.
+        """
+        return enemy in self._searches
+
+    def deliver(self, budget: Optional[float] = None) -> int:
+        """
+        Hand the paths found since the last call to their enemies.
+
+        Args:
+            budget (float, optional): The milliseconds spent delivering paths, at least one being delivered. The rest
+                are left for the next call. Defaults to None, delivering every path found.
+
+        Returns:
+            int: The number of paths delivered.
+        """
+        deadline = None if budget is None else time.perf_counter() + budget / 1000
+        delivered = 0
+        for enemy, (future, start, end, mode, request) in list(self._searches.items()):
+            if deadline is not None and delivered and time.perf_counter() >= deadline:
+                break
+            if not future.done():
+                continue
+            del self._searches[enemy]
+            error = future.exception()
+            if error is not None:
+                # The request is dropped, the enemy plans again once its current path is walked
+                self.failed += 1
+                traceback.print_exception(error)
+            elif enemy.alive():
+                enemy.receive_path(future.result(), start, end, mode, **request)
+                delivered += 1
+        self.delivered += delivered
+        return delivered
+
+    def close(self) -> None:
+        """
+        Stop the workers and drop the searches pending. The workers are started again by the next search.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._layout is not None:
+            self._layout.close()
+            self._layout = None
+        self._searches.clear()
@@ -4,6 +4,18 @@ from utils.constants import SQUARE_SIZE
 
 
 class SpriteSheet:
+    """
+    A sprite sheet sliced into frames of the same size.
+
+    Every frame is cut from the sheet the first time it is requested and the same surface is returned afterwards, so
+    callers must not draw on the surfaces they receive. The horizontally flipped version of a frame is also made only
+    once, the first time it is requested, unless every frame has been flipped beforehand with flip_frames.
+
+    Attributes:
+        hits (int): The number of requests answered with a cached frame.
+        allocations (int): The number of frame surfaces created.
+    """
+
     def __init__(self, filename: str, total_columns: int, total_rows: int, tile_size: int = SQUARE_SIZE):
         """
         Initialize a SpriteSheet object.
@@ -21,37 +33,81 @@ class SpriteSheet:
         self.sprite_sheet = pygame.transform.scale(
             pygame.image.load(filename),
             (total_columns * tile_size, total_rows * tile_size))
+        if pygame.display.get_surface() is not None:
+            self.sprite_sheet = self.sprite_sheet.convert_alpha()
         self.tile_size = tile_size
         self.total_columns = total_columns
+        self.total_rows = total_rows
+
+        # Frames sliced from the sheet and their flipped versions, by (x, y) position
+        self._frames = {}
+        self._flipped_frames = {}
+        self.hits = 0
+        self.allocations = 0
+
+    def flip_frames(self) -> None:
+        """
+        Cut every frame of the sheet and make its flipped version right away, so no frame is made while drawing.
+        """
+        if len(self._flipped_frames) == self.total_rows * self.total_columns:
+            return
+        for y in range(self.total_rows):
+            for x in range(self.total_columns):
+                self.get_sprite(x, y, True)
 
-    def get_sprite(self, x: int, y: int) -> pygame.Surface:
+    def get_sprite(self, x: int, y: int, flipped: bool = False) -> pygame.Surface:
         """
         Retrieve a sprite from the sprite sheet at the specified position.
 
         Args:
             x (int): The column index of the sprite.
             y (int): The row index of the sprite.
+            flipped (bool, optional): Whether to get the sprite flipped horizontally. Defaults to False.
 
         Returns:
             pygame.Surface: The sprite image.
         """
+        if flipped:
+            sprite = self._flipped_frames.get((x, y))
+            if sprite is not None:
+                self.hits += 1
+                return sprite
+
+            sprite = pygame.transform.flip(self.get_sprite(x, y), True, False)
+            sprite.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+
+            self.allocations += 1
+            self._flipped_frames[(x, y)] = sprite
+            return sprite
+
+        sprite = self._frames.get((x, y))
+        if sprite is not None:
+            self.hits += 1
+            return sprite
+
         sprite = pygame.Surface((self.tile_size, self.tile_size))
-        sprite.set_colorkey((0, 0, 0))
         sprite.blit(self.sprite_sheet, (0, 0), (x * self.tile_size, y * self.tile_size, self.tile_size, self.tile_size))
+        if pygame.display.get_surface() is not None:
+            sprite = sprite.convert()
+        sprite.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+
+        self.allocations += 1
+        self._frames[(x, y)] = sprite
         return sprite
 
-    def get_sprite_by_number(self, number: int) -> pygame.Surface:
+    def get_sprite_by_number(self, number: int, flipped: bool = False) -> pygame.Surface:
         """
         Retrieve a sprite from the sprite sheet based on its sequential number.
 
         Args:
             number (int): The sequential number of the sprite.
+            flipped (bool, optional): Whether to get the sprite flipped horizontally. Defaults to False.
 
         Returns:
             pygame.Surface: The sprite image.
         """
         if number < 0:
-            return self.get_sprite(10, 7)
+            return self.get_sprite(10, 7, flipped)
         x = number % self.total_columns
         y = number // self.total_columns
-        return self.get_sprite(x, y)
+        return self.get_sprite(x, y, flipped)
@@ -2,7 +2,7 @@ import pygame
 from pygame import Surface
 
 from game.entities.player import Player
-from game.sprites.spritesheet import SpriteSheet
+from managers.resource_manager import ResourceManager
 from utils.paths.assets_paths import UI_ICONS
 
 
@@ -18,7 +18,7 @@ class Keys(pygame.sprite.Sprite):
         self.tile_id = 36
 
         # Preload sprite sheet
-        self._sprite_sheet = SpriteSheet(UI_ICONS, 10, 9, self.tile_size)
+        self._sprite_sheet = ResourceManager.load_sprite_sheet(UI_ICONS, 10, 9, self.tile_size)
 
         # Initialize tile during initialization
         self.tile = self._sprite_sheet.get_sprite_by_number(self.tile_id)
@@ -0,0 +1,126 @@
+from typing import List, Sequence, Tuple
+
+import pygame
+
+Point = Tuple[float, float]
+
+
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+#                                     PLAYER DETECTION                                          #
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+
+def vision_polygon(enemy) -> List[Point]:
+    """
+    Build the visibility polygon of an enemy from the corners of its last cast, in world coordinates.
+
+    Args:
+        enemy (Enemy): The enemy whose polygon is built.
+
+    Returns:
+        List[Point]: The vertices of the polygon.
+    """
+    vertices = []
+    for point1, point2 in enemy.corners:
+        vertices.append(point1)
+        vertices.append(point2)
+    return vertices
+
+
+def enemy_body(enemy) -> pygame.Rect:
+    """
+    Get the square occupied by an enemy, which also reveals the player on contact.
+
+    Args:
+        enemy (Enemy): The enemy.
+
+    Returns:
+        pygame.Rect: The square of the enemy, in world coordinates.
+    """
+    return pygame.Rect(int(enemy.x) - enemy.size / 2, int(enemy.y) - enemy.size / 2, enemy.size, enemy.size)
+
+
+def _point_in_rect(point: Point, rect: pygame.Rect) -> bool:
+    return rect.left <= point[0] <= rect.right and rect.top <= point[1] <= rect.bottom
+
+
+def _point_in_polygon(point: Point, polygon: Sequence[Point]) -> bool:
+    # Even-odd rule, the same one used to fill the polygon when it is drawn
+    x, y = point
+    inside = False
+    previous_x, previous_y = polygon[-1]
+    for current_x, current_y in polygon:
+        if (current_y > y) != (previous_y > y):
+            cross_x = current_x + (y - current_y) * (previous_x - current_x) / (previous_y - current_y)
+            if x < cross_x:
+                inside = not inside
+        previous_x, previous_y = current_x, current_y
+    return inside
+
+
+def _segment_intersects_rect(start: Point, end: Point, rect: pygame.Rect) -> bool:
+    # Liang-Barsky clipping of the segment against the rectangle
+    delta_x = end[0] - start[0]
+    delta_y = end[1] - start[1]
+    entry, leave = 0.0, 1.0
+    for p, q in ((-delta_x, start[0] - rect.left), (delta_x, rect.right - start[0]),
+                 (-delta_y, start[1] - rect.top), (delta_y, rect.bottom - start[1])):
+        if p == 0:
+            if q < 0:
+                return False
+            continue
+        t = q / p
+        if p < 0:
+            entry = max(entry, t)
+        else:
+            leave = min(leave, t)
+        if entry > leave:
+            return False
+    return True
+
+
+def rect_intersects_polygon(rect: pygame.Rect, polygon: Sequence[Point]) -> bool:
+    """
+    Check if a rectangle and a polygon overlap.
+
+    Args:
+        rect (pygame.Rect): The rectangle.
+        polygon (Sequence[Point]): The vertices of the polygon. Polygons with fewer than three vertices are empty.
+
+    Returns:
+        bool: True if any point of the rectangle lies in the polygon, False otherwise.
+    """
+    if len(polygon) <= 2:
+        return False
+
+    xs = [point[0] for point in polygon]
+    ys = [point[1] for point in polygon]
+    if max(xs) < rect.left or min(xs) > rect.right or max(ys) < rect.top or min(ys) > rect.bottom:
+        return False
+
+    if _point_in_polygon(rect.center, polygon):
+        return True
+
+    previous = polygon[-1]
+    for current in polygon:
+        if _segment_intersects_rect(previous, current, rect):
+            return True
+        previous = current
+
+    # No edge crosses the rectangle and its center is outside, so the polygon does not reach it
+    return False
+
+
+def get_observers(player_rect: pygame.Rect, enemies) -> List:
+    """
+    Get the enemies that see the player. The test is done in world coordinates, so it does not depend on the camera.
+
+    Args:
+        player_rect (pygame.Rect): The rectangle of the player, in world coordinates.
+        enemies (Iterable[Enemy]): The enemies to test.
+
+    Returns:
+        List[Enemy]: The enemies whose body or visibility polygon overlaps the player.
+    """
+    return [enemy for enemy in enemies
+            if player_rect.colliderect(enemy_body(enemy)) or
+            rect_intersects_polygon(player_rect, vision_polygon(enemy))]
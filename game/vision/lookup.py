@@ -0,0 +1,204 @@
+import hashlib
+import os
+import zipfile
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from utils.constants import VISIBILITY_BUCKETS, VISIBILITY_REACH
+
+Corner = tuple
+
+
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+#                                   VISIBILITY TABLE CLASS                                      #
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+
+class VisibilityTable:
+    """
+    Precomputed distance from every walkable square to the first barrier, for a fixed set of directions.
+
+    The rays are cast once from the centre of each walkable square with the RayCaster, one per angle bucket, and the
+    distance to their contact point is stored in pixels. Casting a vision cone then becomes a table lookup and a linear
+    interpolation between the two closest buckets. The rays start at the centre of the square holding the enemy, so
+    the polygon is an approximation of the cast from the exact position of the enemy.
+
+    The table is saved next to the border map of the level, together with a digest of the map, and it is built again
+    whenever the map changes.
+
+    Attributes:
+        grid (Grid): The grid the table was built for.
+        layout_version (int): The layout version of the grid the table was built for.
+        buckets (int): The number of directions stored for every square.
+        reach (int): The number of grid lines a stored ray can cross.
+        cells (np.ndarray): The row of the table of each square, or -1 for barriers.
+        distances (np.ndarray): The distance to the first barrier of each walkable square and direction.
+    """
+
+    def __init__(self, grid, buckets: int = VISIBILITY_BUCKETS, reach: int = VISIBILITY_REACH):
+        """
+        Initialize an empty table. Use VisibilityTable.load to get a table ready to cast.
+
+        Args:
+            grid (Grid): The grid the table is built for.
+            buckets (int, optional): The number of directions stored for every square. Defaults to VISIBILITY_BUCKETS.
+            reach (int, optional): The number of grid lines a stored ray can cross. Defaults to VISIBILITY_REACH.
+        """
+        self.grid = grid
+        self.layout_version = grid.layout_version
+        self.buckets = buckets
+        self.reach = reach
+        self.casts = 0
+
+        walkable = ~grid.barrier
+        self.cells = np.full(walkable.shape, -1, dtype=np.int32)
+        self.cells[walkable] = np.arange(np.count_nonzero(walkable), dtype=np.int32)
+        self.distances = None
+
+    # ####################################################################### #
+    #                                  STORAGE                                #
+    # ####################################################################### #
+
+    @staticmethod
+    def get_path(source_path: str) -> str:
+        """
+        Get the path of the table file of a border map.
+
+        Args:
+            source_path (str): The path of the border map file.
+
+        Returns:
+            str: The path of the table file, next to the border map.
+        """
+        return os.path.splitext(source_path)[0] + '_visibility.npz'
+
+    def _digest(self, source_path: Optional[str]) -> str:
+        digest = hashlib.sha1()
+        if source_path is not None and os.path.exists(source_path):
+            with open(source_path, 'rb') as file:
+                digest.update(file.read())
+        digest.update(self.grid.barrier.tobytes())
+        digest.update(f'{self.grid.gap}:{self.buckets}:{self.reach}'.encode())
+        return digest.hexdigest()
+
+    @classmethod
+    def load(cls, grid, source_path: Optional[str] = None, buckets: int = VISIBILITY_BUCKETS,
+             reach: int = VISIBILITY_REACH) -> 'VisibilityTable':
+        """
+        Load the table of a grid from disk, or build it and save it if it is missing or out of date.
+
+        Args:
+            grid (Grid): The grid of the table.
+            source_path (str, optional): The path of the border map of the grid. Without it the table is only kept
+                in memory. Defaults to None.
+            buckets (int, optional): The number of directions stored for every square. Defaults to VISIBILITY_BUCKETS.
+            reach (int, optional): The number of grid lines a stored ray can cross. Defaults to VISIBILITY_REACH.
+
+        Returns:
+            VisibilityTable: The table, ready to cast.
+        """
+        table = cls(grid, buckets, reach)
+        digest = table._digest(source_path)
+        path = cls.get_path(source_path) if source_path is not None else None
+
+        if path is not None and os.path.exists(path):
+            try:
+                with np.load(path) as data:
+                    if str(data['digest']) == digest:
+                        table.distances = data['distances']
+                        return table
+            except (OSError, EOFError, ValueError, KeyError, zipfile.BadZipFile):
+                pass  # A truncated or corrupt table is built again and overwritten
+
+        table.build()
+        if path is not None:
+            try:
+                np.savez_compressed(path, digest=np.array(digest), distances=table.distances)
+            except OSError:
+                pass  # The table still works from memory when the level folder is read-only
+        return table
+
+    # ####################################################################### #
+    #                                   BUILD                                 #
+    # ####################################################################### #
+
+    def build(self, batch_size: int = 65536) -> None:
+        """
+        Cast the rays of every walkable square and store their distances.
+
+        Args:
+            batch_size (int, optional): The number of rays cast at once. Defaults to 65536.
+        """
+        # Imported here to avoid a circular import, the ray caster loads tables itself
+        from game.vision.raycaster import RayCaster
+
+        caster = RayCaster(self.grid)
+        gap = self.grid.gap
+        rows, cols = np.nonzero(self.cells >= 0)
+        centers_x = rows * gap + gap / 2
+        centers_y = cols * gap + gap / 2
+
+        degrees = np.arange(self.buckets) * (360 / self.buckets)
+        # Rays pointing straight up or down get the same nudge as in the cones of the enemies
+        degrees = np.where((degrees == 90) | (degrees == 270), degrees + 0.001, degrees)
+
+        origin_x = np.repeat(centers_x, self.buckets)
+        origin_y = np.repeat(centers_y, self.buckets)
+        degree = np.tile(degrees, len(rows))
+        distances = np.empty(len(degree), dtype=np.uint16)
+
+        for first in range(0, len(degree), batch_size):
+            batch = slice(first, first + batch_size)
+            contact_x, contact_y = caster.march(origin_x[batch], origin_y[batch], degree[batch], degree[batch],
+                                                np.full(len(degree[batch]), self.reach))
+            distance = np.hypot(contact_x - origin_x[batch], contact_y - origin_y[batch])
+            distances[batch] = np.minimum(np.round(distance), np.iinfo(np.uint16).max)
+
+        self.distances = distances.reshape(len(rows), self.buckets)
+
+    # ####################################################################### #
+    #                                   CAST                                  #
+    # ####################################################################### #
+
+    def cast(self, enemies: Sequence) -> None:
+        """
+        Cast the vision cones of the given enemies from the table and update their corners.
+
+        Args:
+            enemies (Sequence[Enemy]): The enemies whose vision is cast.
+        """
+        gap = self.grid.gap
+        for enemy in enemies:
+            row = min(max(int(enemy.x // gap), 0), self.grid.size - 1)
+            col = min(max(int(enemy.y // gap), 0), self.grid.size - 1)
+            cell = self.cells[row, col]
+
+            degrees = (enemy.angle + enemy.ray_cone / 2 - np.arange(int(enemy.ray_cone) + 1)) % 360
+            radians = np.radians(degrees)
+
+            # A ray that reaches no barrier stops after crossing as many lines as the reach of the enemy
+            limit = enemy.ray_reach * gap / np.maximum(np.abs(np.cos(radians)), np.abs(np.sin(radians)))
+            if cell >= 0:
+                position = degrees * (self.buckets / 360)
+                lower = np.floor(position).astype(np.intp) % self.buckets
+                upper = (lower + 1) % self.buckets
+                weight = position - np.floor(position)
+                distances = self.distances[cell]
+                distance = distances[lower] * (1 - weight) + distances[upper] * weight
+                distance = np.minimum(distance, limit)
+            else:
+                distance = np.zeros_like(degrees)
+
+            contact_x = enemy.x + np.cos(radians) * distance
+            contact_y = enemy.y - np.sin(radians) * distance
+            enemy.corners = self._corners(enemy, contact_x, contact_y)
+        self.casts += len(enemies)
+
+    @staticmethod
+    def _corners(enemy, contact_x: np.ndarray, contact_y: np.ndarray) -> List[Corner]:
+        origin = (enemy.x, enemy.y)
+        points = list(zip(contact_x.tolist(), contact_y.tolist()))
+        corners = [(origin, points[0])]
+        corners.extend(zip(points, points[1:]))
+        corners.append((points[-1], origin))
+        return corners
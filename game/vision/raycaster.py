@@ -0,0 +1,294 @@
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from game.vision.lookup import VisibilityTable
+from game.vision.shadowcaster import ShadowCaster
+from utils.constants import VISION_ANGLE_TOLERANCE, VISION_POSITION_TOLERANCE
+from utils.enums import VisionEngine
+
+Corner = tuple
+
+
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+#                                       RAY CASTER CLASS                                        #
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+
+class RayCaster:
+    """
+    Batched ray caster for the vision cones of the enemies.
+
+    The rays of every enemy are cast together with NumPy against the barrier array of the grid, one ray per degree of
+    each cone. The rays march through the grid with the same horizontal and vertical steps as the former per-enemy
+    caster, and the contact points are merged into the same corners structure.
+
+    The last cast of each enemy is remembered, keyed on its quantized position, angle, cone and reach, and an enemy
+    that has not moved or turned beyond the vision tolerances keeps its corners.
+
+    Enemies whose vision engine is VisionEngine.LOOKUP are cast from the precomputed visibility table of the grid,
+    which is loaded the first time one of them is cast, and those whose engine is VisionEngine.SHADOWCAST are swept
+    against the merged walls of the grid by its ShadowCaster.
+
+    Attributes:
+        grid (Grid): The grid whose barriers stop the rays.
+        casts (int): The number of enemy casts done.
+        skipped (int): The number of enemy casts skipped because the enemy had not changed.
+    """
+
+    def __init__(self, grid):
+        """
+        Initialize the ray caster of a grid.
+
+        Args:
+            grid (Grid): The grid whose barriers stop the rays.
+        """
+        self.grid = grid
+        self.casts = 0
+        self.skipped = 0
+        self._keys = {}
+        self._table = None
+        self._shadow_caster = None
+
+    # ####################################################################### #
+    #                                  CACHE                                  #
+    # ####################################################################### #
+
+    def _key(self, enemy) -> tuple:
+        return (
+            round(enemy.x / VISION_POSITION_TOLERANCE),
+            round(enemy.y / VISION_POSITION_TOLERANCE),
+            round(enemy.angle / VISION_ANGLE_TOLERANCE),
+            enemy.ray_cone,
+            enemy.ray_reach,
+            self.grid.layout_version
+        )
+
+    def forget(self, enemies: Sequence = None) -> None:
+        """
+        Forget the last cast of the given enemies, or of every enemy, so their vision is cast again.
+
+        Args:
+            enemies (Sequence[Enemy], optional): The enemies to forget. Defaults to every enemy.
+        """
+        if enemies is None:
+            self._keys.clear()
+        else:
+            for enemy in enemies:
+                self._keys.pop(enemy, None)
+
+    def get_table(self) -> VisibilityTable:
+        """
+        Get the precomputed visibility table of the grid, loading or building it the first time, and again after the
+        layout changes.
+
+        Returns:
+            VisibilityTable: The visibility table.
+        """
+        if self._table is None or self._table.layout_version != self.grid.layout_version:
+            self._table = VisibilityTable.load(self.grid, getattr(self.grid, 'border_map_path', None))
+        return self._table
+
+    def get_shadow_caster(self) -> ShadowCaster:
+        """
+        Get the shadow caster of the grid, creating it the first time.
+
+        Returns:
+            ShadowCaster: The shadow caster.
+        """
+        if self._shadow_caster is None:
+            self._shadow_caster = ShadowCaster(self.grid)
+        return self._shadow_caster
+
+    # ####################################################################### #
+    #                                   RAYS                                  #
+    # ####################################################################### #
+
+    @staticmethod
+    def _ray_degrees(angle: float, cone: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the degrees of the rays of a cone, from the left edge of the cone to the right one.
+
+        Args:
+            angle (float): The direction the enemy is looking at, in degrees.
+            cone (float): The width of the cone, in degrees.
+
+        Returns:
+            tuple: The degree of each ray, and the degree used for its slope, which differs for a ray pointing straight
+            up or down.
+        """
+        start = (angle + cone / 2 + 1) % 360
+        end = (angle - cone / 2) % 360
+
+        degrees = (start - np.arange(1, int(cone) + 4)) % 360
+        slopes = degrees.copy()
+
+        # A ray pointing straight up or down is nudged after taking its slope, and every following ray is shifted too
+        vertical = np.flatnonzero((degrees == 90) | (degrees == 270))
+        if len(vertical) > 0:
+            degrees[vertical[0]:] += 0.001
+            slopes[vertical[0] + 1:] += 0.001
+
+        if start <= end:
+            inside = (degrees <= start) | (degrees >= end)
+        else:
+            inside = (end <= degrees) & (degrees <= start)
+
+        # The ray that leaves the cone is still cast
+        outside = np.flatnonzero(~inside)
+        count = outside[0] + 1 if len(outside) > 0 else len(degrees)
+        return degrees[:count], slopes[:count]
+
+    def _march(self, ray_x, ray_y, offset_x, offset_y, steps, shift_x, shift_y) -> None:
+        """
+        Move every ray, in place, one grid line at a time until it reaches a barrier or runs out of steps.
+
+        Args:
+            ray_x (np.ndarray): The horizontal position of each ray.
+            ray_y (np.ndarray): The vertical position of each ray.
+            offset_x (np.ndarray): The horizontal distance moved by each ray at every step.
+            offset_y (np.ndarray): The vertical distance moved by each ray at every step, subtracted from its position.
+            steps (np.ndarray): The maximum number of steps of each ray.
+            shift_x (np.ndarray): The column shift of the cell checked by each ray.
+            shift_y (np.ndarray): The row shift of the cell checked by each ray.
+        """
+        gap = self.grid.gap
+        size = self.grid.size
+        barrier = self.grid.barrier.ravel()
+
+        active = steps > 0
+        for step in range(int(steps.max(initial=0))):
+            map_x = ray_x // gap - shift_x
+            map_y = ray_y // gap - shift_y
+            inside = active & (map_x >= 0) & (map_x < size) & (map_y >= 0) & (map_y < size)
+            cells = np.where(inside, map_x * size + map_y, 0).astype(np.intp)
+            hit = inside & barrier[cells]
+
+            moving = active & ~hit
+            np.add(ray_x, offset_x, out=ray_x, where=moving)
+            np.subtract(ray_y, offset_y, out=ray_y, where=moving)
+            active = moving & (step + 1 < steps)
+            if not active.any():
+                break
+
+    # ####################################################################### #
+    #                                   CAST                                  #
+    # ####################################################################### #
+
+    def cast(self, enemies: Sequence) -> None:
+        """
+        Cast the vision cones of the given enemies that have moved or turned, and update their corners.
+
+        Args:
+            enemies (Sequence[Enemy]): The enemies whose vision is cast.
+        """
+        pending = []
+        for enemy in enemies:
+            key = self._key(enemy)
+            if self._keys.get(enemy) == key and enemy.corners:
+                self.skipped += 1
+                continue
+            self._keys[enemy] = key
+            pending.append(enemy)
+
+        lookup = [enemy for enemy in pending if enemy.vision_engine == VisionEngine.LOOKUP]
+        if lookup:
+            self.get_table().cast(lookup)
+            self.casts += len(lookup)
+
+        shadow = [enemy for enemy in pending if enemy.vision_engine == VisionEngine.SHADOWCAST]
+        if shadow:
+            self.get_shadow_caster().cast(shadow)
+            self.casts += len(shadow)
+
+        enemies = [enemy for enemy in pending
+                   if enemy.vision_engine not in (VisionEngine.LOOKUP, VisionEngine.SHADOWCAST)]
+        if not enemies:
+            return
+
+        degrees, slopes = zip(*[self._ray_degrees(enemy.angle, enemy.ray_cone) for enemy in enemies])
+        counts = np.array([len(ray_degrees) for ray_degrees in degrees])
+
+        # Every ray carries the position and reach of its enemy
+        origin_x = np.repeat([float(enemy.x) for enemy in enemies], counts)
+        origin_y = np.repeat([float(enemy.y) for enemy in enemies], counts)
+        steps = np.repeat([enemy.ray_reach for enemy in enemies], counts)
+        contact_x, contact_y = self.march(origin_x, origin_y, np.concatenate(degrees), np.concatenate(slopes), steps)
+
+        first = 0
+        for enemy, count in zip(enemies, counts.tolist()):
+            enemy.corners = self._corners(enemy, contact_x[first:first + count], contact_y[first:first + count])
+            first += count
+        self.casts += len(enemies)
+
+    def march(self, origin_x, origin_y, degree, slope, reach) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find where a batch of rays first meets a barrier.
+
+        Every ray is marched twice, once between the horizontal lines of the grid and once between the vertical ones,
+        and the closest of both contact points is kept. A ray that reaches no barrier stops after crossing as many
+        lines as its reach.
+
+        Args:
+            origin_x (np.ndarray): The horizontal position each ray starts from.
+            origin_y (np.ndarray): The vertical position each ray starts from.
+            degree (np.ndarray): The direction of each ray, in degrees.
+            slope (np.ndarray): The direction used for the slope of each ray, in degrees.
+            reach (np.ndarray): The number of lines each ray can cross.
+
+        Returns:
+            tuple: The horizontal and vertical positions of the contact point of each ray.
+        """
+        gap = self.grid.gap
+        steps = np.ceil(np.minimum(reach, self.grid.size)).astype(np.int64)
+
+        tangent = np.tan(np.radians(slope))
+        flat = tangent == 0
+        safe_tangent = np.where(flat, 1, tangent)
+
+        # Horizontal rays, stopping at the horizontal lines of the grid
+        up = degree <= 180
+        horizontal_y = np.ceil(origin_y / gap) * gap + np.where(up, -gap, 0.001)
+        step_y = np.where(up, gap, -gap).astype(float)
+        horizontal_x = np.where(flat, origin_x, (origin_y - horizontal_y) / safe_tangent + origin_x)
+        step_x = np.where(flat, 0, step_y / safe_tangent)
+        self._march(horizontal_x, horizontal_y, step_x, step_y, steps, np.zeros_like(degree), up.astype(float))
+
+        # Vertical rays, stopping at the vertical lines of the grid
+        right = ~((90 < degree) & (degree < 270))
+        vertical_x = np.ceil(origin_x / gap) * gap + np.where(right, 0.001, -gap)
+        step_x = np.where(right, gap, -gap).astype(float)
+        vertical_y = np.where(flat, origin_y, (origin_x - vertical_x) * tangent + origin_y)
+        step_y = np.where(flat, 0, step_x * tangent)
+        self._march(vertical_x, vertical_y, step_x, step_y, steps, (~right).astype(float), np.zeros_like(degree))
+
+        horizontal_distance = np.sqrt((horizontal_x - origin_x) ** 2 + (horizontal_y - origin_y) ** 2)
+        vertical_distance = np.sqrt((vertical_x - origin_x) ** 2 + (vertical_y - origin_y) ** 2)
+        vertical_first = vertical_distance < horizontal_distance
+        contact_x = np.where(vertical_first, vertical_x, horizontal_x)
+        contact_y = np.where(vertical_first, vertical_y, horizontal_y)
+        return contact_x, contact_y
+
+    @staticmethod
+    def _corners(enemy, contact_x: np.ndarray, contact_y: np.ndarray) -> List[Corner]:
+        """
+        Merge the contact points of the rays of an enemy into the corners of its visibility polygon.
+
+        A contact point is skipped when it shares a coordinate with the previous one, since both lie on the same wall.
+
+        Args:
+            enemy (Enemy): The enemy whose rays were cast.
+            contact_x (np.ndarray): The horizontal position of each contact point.
+            contact_y (np.ndarray): The vertical position of each contact point.
+
+        Returns:
+            List[Corner]: Pairs of points, each one joining a corner to the next one.
+        """
+        origin = (enemy.x, enemy.y)
+        points = list(zip(contact_x.tolist(), contact_y.tolist()))
+
+        kept = np.ones(len(points), dtype=bool)
+        kept[1:] = (contact_x[1:] != contact_x[:-1]) & (contact_y[1:] != contact_y[:-1])
+
+        corners = [(points[index - 1] if index > 0 else origin, points[index]) for index in np.flatnonzero(kept).tolist()]
+        corners.append((points[-1], origin))
+        return corners
@@ -17,6 +17,7 @@ from game.ui.ui_bar import Bar
 from game.ui.ui_keys import Keys
 from game.ui.ui_level import Indicator
 from game.ui.ui_text import Message
+from game.vision.detection import get_observers, vision_polygon
 from managers.prototypes.scene_prototype import Scene
 from utils.constants import *
 from utils.i18n import get_translation
@@ -128,10 +129,13 @@ class GameManager(Scene):
     def update(self, **kwargs):
         if not self.is_open_menu() and self.end_current_frame < 0:
             kwargs['player'] = self.player
-            kwargs['player_mask'] = self.all_sprites.return_player_mask(self.player)
-            kwargs['enemy_mask'] = self._render()
+            kwargs['observers'] = get_observers(self.player.rect, self.enemies.sprites())
+            self._render()
             kwargs['language'] = self.manager.get_language()
+            self.enemies.deliver()
             self.all_sprites.update(**kwargs)
+            self.enemies.plan()
+            self.enemies.cast()
             self.interface.update(**kwargs)
 
     def notified(self):
@@ -177,6 +181,7 @@ class GameManager(Scene):
 
     def _close(self):
         self._restart()
+        self.grid.release()
         self.audio.music_menu()
         self.manager.change_scene()
 
@@ -184,6 +189,7 @@ class GameManager(Scene):
         level_number = self.level.level_number
 
         self._restart()
+        self.grid.release()
 
         if level_number == len(LEVELS):
             # Pantalla ganadora
@@ -194,7 +200,9 @@ class GameManager(Scene):
             self.manager.advance_level(level_number + 1)
 
     def _start(self):
-        self.key_x, self.key_y = (self.grid.get_random_node_from_zones(self.level.key_zones)).get_grid_pos()
+        # Key zones that cannot be reached from the spawn are left out, unless none can
+        key_zones = self.grid.get_room_table().rank(self.grid.spawn.get_id(), self.level.key_zones)
+        self.key_x, self.key_y = (self.grid.get_random_node_from_zones(key_zones or self.level.key_zones)).get_grid_pos()
         self.grid.set_key_square(self.key_x, self.key_y)
 
         self.end_current_frame = -1
@@ -228,14 +236,7 @@ class GameManager(Scene):
 
     def _render(self):
         for enemy in self.enemies.sprites():
-            vertices = []
-            for pair in enemy.corners:
-                point1, point2 = pair
-                vertices.append(point1)
-                vertices.append(point2)
-            self.all_sprites.save_enemy_mask(enemy, vertices)
-
-        return self.all_sprites.return_enemy_mask()
+            self.all_sprites.save_enemy_mask(enemy, vision_polygon(enemy))
 
     def _add_player(self, player):
         self.player = player
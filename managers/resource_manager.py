@@ -2,6 +2,8 @@ import os
 import pygame
 from pygame.locals import *
 
+from game.sprites.spritesheet import SpriteSheet
+
 
 # ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
 #                                        RESOURCE MANAGER                                       #
@@ -33,6 +35,33 @@ class ResourceManager(object):
 
             return image
 
+    @classmethod
+    def load_sprite_sheet(cls, name: str, total_columns: int, total_rows: int, tile_size: int,
+                          flipped: bool = False) -> SpriteSheet:
+        """
+        Get the sprite sheet of an image, loading it the first time it is requested.
+
+        Sprite sheets are shared by every caller that asks for the same image, grid and tile size, so the image is
+        decoded and scaled once and its frames are sliced once for the whole game.
+
+        Args:
+            name (str): The filename of the sprite sheet image.
+            total_columns (int): The total number of columns in the sprite sheet.
+            total_rows (int): The total number of rows in the sprite sheet.
+            tile_size (int): The size of each tile in pixels.
+            flipped (bool, optional): Whether to make every frame and its flipped version now, for the sheets of the
+                animated entities. Defaults to False.
+
+        Returns:
+            SpriteSheet: The shared sprite sheet.
+        """
+        key = (name, total_columns, total_rows, tile_size)
+        if key not in cls.resources:
+            cls.resources[key] = SpriteSheet(name, total_columns, total_rows, tile_size)
+        if flipped:
+            cls.resources[key].flip_frames()
+        return cls.resources[key]
+
     @classmethod
     def load_coordinates(cls, index, filename):
         with open(filename, 'r') as file:
@@ -7,6 +7,10 @@ NPC_ANGLE = 90.0  # Represents the initial angle in degrees for all enemy entiti
 VIEW_OFFSET = 2.5  # Represents the offset value for the entity's directional indicator (triangle), indicating its orientation.
 FIELD_OF_VISION = 90
 REACH_OF_VISION = 5
+VISION_POSITION_TOLERANCE = 0.5  # Represents the distance in pixels an entity can move before its vision is cast again.
+VISION_ANGLE_TOLERANCE = 0.5  # Represents the angle in degrees an entity can turn before its vision is cast again.
+VISIBILITY_BUCKETS = 360  # Represents the number of directions stored per square in the precomputed visibility table.
+VISIBILITY_REACH = 10  # Represents the number of grid lines a ray of the precomputed visibility table can cross.
 
 # ####################################################################### #
 #                               MAP CONSTANTS                             #
@@ -14,6 +18,8 @@ REACH_OF_VISION = 5
 
 GRID_BACKGROUND = (0, 0, 0)
 SQUARE_SIZE = 50  # Represents the size of each square in pixels on the grid.
+CHUNK_SIZE = 8  # Represents the number of squares per side of each pre-rendered chunk of the map.
+WALL_BUCKET_SIZE = 4  # Represents the number of squares per side of each bucket of the wall index of the map.
 MAP = 'game/map/files/mapa_bueno_1_bordes.csv'  # Represents the path to the file containing the map information.
 TILE_MAP = 'game/map/files/mapa_bueno_1_tiles.csv'  # Represents the path to the file containing the tile map information.
 
@@ -43,6 +49,9 @@ ORANGE = (255, 165, 0)
 GREY = (200, 200, 200)
 TURQUOISE = (64, 224, 208)
 
+SHADOW_COLOR = (0, 0, 0, 100)  # Represents the colour of the shadow drawn over the areas not seen by any enemy.
+LIGHT_COLOR = (0, 0, 0, 0)  # Represents the colour of the areas seen by the enemies in the shadow surface.
+
 # ####################################################################### #
 #                               MENU CONSTANTS                            #
 # ####################################################################### #
@@ -71,6 +80,14 @@ FINISHED_GAME_MENU_ID = "finished game menu"
 
 WEIGHT = 2
 
+# Offsets (row, col) of the surrounding squares, in the order in which neighbours are reported. The last four entries
+# are diagonals, each one only reachable when both of the cardinal squares next to it are free.
+NEIGHBOUR_OFFSETS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, -1), (-1, -1), (1, 1), (-1, 1))
+PATH_CACHE_SIZE = 256  # Represents the number of paths kept by the path cache shared by the enemies of a grid.
+PATH_BUDGET = 2.0  # Represents the milliseconds per frame spent planning the paths requested by the enemies of a level.
+PATH_WORKERS = 0  # Represents the number of workers searching paths off the main thread, or 0 to search them on it.
+ESCAPE_ROOMS = 3  # Represents the number of rooms nearest to a civilian it chooses the room it escapes to from.
+
 # ####################################################################### #
 #                              PLAYER CONSTANTS                           #
 # ####################################################################### #
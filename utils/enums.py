@@ -82,6 +82,41 @@ class Direction(Enum):
         return self.name
 
 
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+#                                        VISION ENGINES                                         #
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+class VisionEngine(Enum):
+    RAYCAST = auto()  # Rays marched through the grid every time the enemy moves or turns
+    LOOKUP = auto()  # Distances read from the precomputed visibility table of the level
+    SHADOWCAST = auto()  # Exact polygon swept against the merged walls of the level
+
+
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+#                                         PATH MODES                                            #
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+class PathMode(Enum):
+    ASTAR = auto()  # A* over every square of the grid
+    HIERARCHICAL = auto()  # Route over the rooms of the level, refined into squares one room at a time
+    FLOW = auto()  # Flow field of the grid, following the distances to the end computed once for every enemy
+
+
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+#                                       PATH PRIORITIES                                         #
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+class PathPriority(Enum):
+    CHASE = 0  # Enemies chasing the player, served first
+    ESCAPE = 1  # Civilians running away from the player
+    PATROL = 2  # Enemies walking their usual route
+
+
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+#                                        PATH WORKERS                                           #
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+class PathWorkers(Enum):
+    THREAD = auto()  # Threads sharing the grid, only parallel while the search releases the GIL
+    PROCESS = auto()  # Processes reading the grid arrays from shared memory
+
+
 # ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
 #                                        CONTROLLERS                                            #
 # ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#